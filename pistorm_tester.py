@@ -9,6 +9,11 @@ import sys
 import time
 import json
 import requests
+from requests.adapters import HTTPAdapter
+try:
+    from urllib3.util.retry import Retry
+except ImportError:
+    Retry = None
 import subprocess
 from pathlib import Path
 from datetime import datetime
@@ -30,7 +35,19 @@ class PiStormTester:
         self.api_key = "4c273a289160db43476e823cfedc262578a7b96407c4728f4ecb24aad86c776f"
         self.base_url = f"http://{self.pi_ip}:{self.pi_port}"
         self.headers = {"X-API-Key": self.api_key, "Content-Type": "application/json"}
-        
+
+        # Persistent session: keep-alive reuse avoids a fresh TCP handshake
+        # for every poll against the Pi
+        self.session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=2,
+            pool_maxsize=4,
+            max_retries=Retry(total=2, backoff_factor=0.2) if Retry else 2,
+        )
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+
         # Test results storage
         self.test_results = {}
         self.logs = []
@@ -48,9 +65,9 @@ class PiStormTester:
             url = f"{self.base_url}/{endpoint.lstrip('/')}"
             
             if method == "GET":
-                response = requests.get(url, headers=self.headers, timeout=timeout)
+                response = self.session.get(url, headers=self.headers, timeout=timeout)
             elif method == "POST":
-                response = requests.post(url, headers=self.headers, json=data, timeout=timeout)
+                response = self.session.post(url, headers=self.headers, json=data, timeout=timeout)
             else:
                 raise ValueError(f"Unsupported method: {method}")
             
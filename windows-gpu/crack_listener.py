@@ -5,17 +5,37 @@ GPU-accelerated WiFi password cracking station for PiStorm platform
 """
 
 import os
+import re
 import time
 import json
+import queue
+import shutil
+import collections
+import signal
 import logging
 import hashlib
+import threading
 import subprocess
 import requests
+from requests.adapters import HTTPAdapter
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
 from pathlib import Path
-from datetime import datetime
 from watchdog.observers import Observer
 from watchdog.events import FileSystemEventHandler
 
+# Optional: orjson is a C extension ~5x faster than stdlib json - worth
+# having on the status path while hashcat stdout is being streamed
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+def _dumps(obj):
+    """Serialize to JSON bytes with orjson when available"""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj).encode()
+
 # Configuration
 INCOMING_DIR = Path.home() / "wifi-crack-pc" / "incoming"
 WORDLISTS_DIR = Path.home() / "wifi-crack-pc" / "wordlists"
@@ -31,99 +51,409 @@ PI_API_KEY = "4c273a289160db43476e823cfedc262578a7b96407c4728f4ecb24aad86c776f"
 HASHCAT_WORKLOAD = 3  # High workload
 HASHCAT_OPTIMIZE = True
 HASHCAT_FORCE = True
+HASHCAT_IDLE_KILL = 120  # Kill a run only when stdout goes quiet this long
+HASHCAT_DEVICE = "1"  # CUDA ordinal of the RTX 4070 Super
+
+# Skip the duplicate OpenCL/HIP enumeration of the same card - CUDA is
+# the fast path on this station and double init wastes startup time
+HASHCAT_BACKEND_ARGS = ["-d", HASHCAT_DEVICE, "--backend-ignore-opencl", "--backend-ignore-hip"]
+
+# Ada Lovelace tuning - pins the kernel geometry so autotune converges
+# instantly instead of probing from scratch every run. Empty the list to
+# fall back to full autotune on other GPUs.
+HASHCAT_KERNEL_TUNING = [
+    "--kernel-accel", "512",
+    "--kernel-loops", "1024",
+    "--kernel-threads", "256"
+]
+
+# Shared potfile so hashes cracked in any session are never re-run
+POTFILE = RESULTS_DIR / "pistorm.potfile"
+
+# Unified deduplicated dictionary built from every discovered wordlist
+MERGED_WORDLIST = "merged-dedup.txt"
+WORDLIST_INDEX = ".index.json"  # cached discovery result, keyed on source mtimes
+
+# hashcat status block: "Progress.........: 12345/67890 (18.17%)"
+_PROGRESS_RE = re.compile(r"Progress\.+:\s*(\d+)/(\d+)")
 
 # Create directories
 for directory in [INCOMING_DIR, WORDLISTS_DIR, RESULTS_DIR, LOGS_DIR]:
     directory.mkdir(parents=True, exist_ok=True)
 
-# Setup logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler(LOGS_DIR / 'crack_listener.log'),
-        logging.StreamHandler()
-    ]
-)
+# Plain-string forms for hot paths - Path.__truediv__ re-normalizes on
+# every call, os.path.join is C-implemented and does not
+INCOMING_DIR_STR = str(INCOMING_DIR)
+RESULTS_DIR_STR = str(RESULTS_DIR)
+
+# Setup logging - emojis stay on the console, but the file handler
+# strips them: re-encoding non-ASCII per record on the Windows console
+# codepage costs more than the line itself, and it keeps the log file
+# plainly greppable
+class _AsciiFormatter(logging.Formatter):
+    def format(self, record):
+        return super().format(record).encode('ascii', 'ignore').decode()
+
+_LOG_FORMAT = '%(asctime)s - %(levelname)s - %(message)s'
+_file_handler = logging.FileHandler(LOGS_DIR / 'crack_listener.log')
+_file_handler.setFormatter(_AsciiFormatter(_LOG_FORMAT))
+_stream_handler = logging.StreamHandler()
+_stream_handler.setFormatter(logging.Formatter(_LOG_FORMAT))
+logging.basicConfig(level=logging.INFO, handlers=[_file_handler, _stream_handler])
 logger = logging.getLogger(__name__)
 
+class _BloomFilter:
+    """Minimal streaming Bloom filter for wordlist deduplication.
+
+    Sized at ~10 bits per expected entry with 4 hash probes (~1% false
+    positives). Probes are carved out of one blake2b digest, so there is
+    no extra dependency. add() returns True when the item was possibly
+    seen before.
+    """
+
+    def __init__(self, capacity):
+        self.bits = max(capacity, 1024) * 10
+        self.buf = bytearray((self.bits + 7) // 8)
+
+    def add(self, item):
+        return self.add_digest(hashlib.blake2b(item, digest_size=16).digest())
+
+    def add_digest(self, digest):
+        seen = True
+        for i in (0, 4, 8, 12):
+            pos = int.from_bytes(digest[i:i + 4], "little") % self.bits
+            byte, bit = divmod(pos, 8)
+            mask = 1 << bit
+            if not self.buf[byte] & mask:
+                seen = False
+                self.buf[byte] |= mask
+        return seen
+
 class CrackHandler(FileSystemEventHandler):
     def __init__(self):
         self.setup_wordlists()
         self.verify_tools()
+
+        # All Pi HTTP traffic goes through one background sender thread so
+        # a slow or flaky LAN round-trip never blocks the crack loop
+        self.sess = requests.Session()
+        self.sess.mount("http://", HTTPAdapter(pool_connections=2, pool_maxsize=4))
+        self._pi_queue = queue.Queue(maxsize=32)
+        # Invariant parts of every Pi payload, built once
+        self._pi_headers = {"X-API-Key": PI_API_KEY, "Content-Type": "application/json"}
+        self._status_template = {"gpu_info": "RTX 4070 Super"}
+        threading.Thread(target=self._pi_sender, daemon=True).start()
+
+        # Captures arrive over the network - hold them until the file
+        # stops growing, and remember content hashes so a retried upload
+        # doesn't trigger a second GPU run
+        self._pending = collections.deque()
+        self._seen_hashes = set()
+        threading.Thread(target=self._debounce_worker, daemon=True).start()
+
+    def _pi_sender(self):
+        """Drain queued Pi updates over one keep-alive session"""
+        while True:
+            kind, url, data, timeout = self._pi_queue.get()
+            try:
+                # Serialize here, in the sender thread, not in the crack loop
+                response = self.sess.post(url, data=_dumps(data),
+                                          headers=self._pi_headers, timeout=timeout)
+                if kind == "result":
+                    if response.status_code == 200:
+                        logger.info("✅ Result sent to Pi successfully")
+                    else:
+                        logger.error("❌ Failed to send result to Pi: %s", response.status_code)
+                elif response.status_code != 200:
+                    logger.warning("Pi status update failed: %s", response.status_code)
+            except Exception as e:
+                if kind == "result":
+                    logger.error("❌ Error sending result to Pi: %s", e)
+                else:
+                    logger.warning("Failed to update Pi status: %s", e)
+            finally:
+                self._pi_queue.task_done()
     
     def setup_wordlists(self):
         """Find and prioritize wordlists"""
         self.wordlists = []
-        
+
+        # One scandir pass instead of a glob plus an exists() stat per
+        # priority name - and the stats double as the cache key below
+        try:
+            entries = self._scan_wordlist_dir()
+        except OSError as e:
+            logger.error("Cannot read wordlists directory: %s", e)
+            return
+
+        # If nothing changed since last start, reuse the previous result
+        # and skip the sort/merge pipeline entirely
+        sources = {name: [size, mtime] for name, (_, size, mtime) in entries.items()}
+        cached = self._load_wordlist_index(sources)
+        if cached is not None:
+            self.wordlists = cached
+            logger.info("Wordlist index up to date: %s list(s)", len(self.wordlists))
+            return
+
         # Priority order for WiFi cracking
         priority_lists = [
             "wifi-wpa-probable.txt",
-            "rockyou.txt", 
+            "rockyou.txt",
             "probable-v2-wpa-top4800.txt",
             "fasttrack.txt",
             "common-passwords.txt"
         ]
-        
+
         # Add priority lists first
+        found = []
         for wordlist in priority_lists:
-            path = WORDLISTS_DIR / wordlist
-            if path.exists():
-                self.wordlists.append(path)
-                logger.info(f"Found priority wordlist: {wordlist}")
-        
+            entry = entries.pop(wordlist, None)
+            if entry is not None:
+                found.append(Path(entry[0]))
+                logger.info("Found priority wordlist: %s", wordlist)
+
         # Add any other .txt files
-        for path in WORDLISTS_DIR.glob("*.txt"):
-            if path not in self.wordlists:
-                self.wordlists.append(path)
-                logger.info(f"Found additional wordlist: {path.name}")
-        
-        logger.info(f"Total wordlists available: {len(self.wordlists)}")
+        for name, entry in entries.items():
+            found.append(Path(entry[0]))
+            logger.info("Found additional wordlist: %s", name)
+
+        # Hand hashcat length-sorted variants: GPU warps stall on the
+        # longest candidate in a batch, so ascending-length order is free
+        # throughput for -a 0 runs
+        self.wordlists = [self.length_sorted_wordlist(p) for p in found]
+
+        # Collapse everything into one deduplicated list - duplicate
+        # candidates across rockyou/probable/etc are pure wasted GPU time
+        merged = self.build_merged_wordlist(self.wordlists)
+        if merged is not None:
+            self.wordlists = [merged]
+
+        self._save_wordlist_index(sources)
+        logger.info("Total wordlists available: %s", len(self.wordlists))
+
+    def _scan_wordlist_dir(self):
+        """Single-pass directory scan: name -> (path, size, mtime)"""
+        entries = {}
+        with os.scandir(WORDLISTS_DIR) as scan:
+            for entry in scan:
+                if entry.name.endswith(".txt") and entry.name != MERGED_WORDLIST and entry.is_file():
+                    st = entry.stat()
+                    entries[entry.name] = (entry.path, st.st_size, st.st_mtime)
+        return entries
+
+    def _load_wordlist_index(self, sources):
+        """Return the cached wordlist order if no source has changed"""
+        try:
+            index = json.loads((WORDLISTS_DIR / WORDLIST_INDEX).read_text())
+            if index.get("sources") != sources:
+                return None
+            paths = [Path(p) for p in index["wordlists"]]
+            if paths and all(p.exists() for p in paths):
+                return paths
+        except (OSError, ValueError, KeyError, TypeError):
+            pass
+        return None
+
+    def _save_wordlist_index(self, sources):
+        """Persist the resolved wordlist order for the next start"""
+        index = {"sources": sources, "wordlists": [str(p) for p in self.wordlists]}
+        try:
+            (WORDLISTS_DIR / WORDLIST_INDEX).write_text(json.dumps(index))
+        except OSError as e:
+            logger.warning("Could not write wordlist index: %s", e)
+
+    def build_merged_wordlist(self, sources):
+        """Merge the discovered wordlists into one deduplicated file.
+
+        Testing the same candidate from two lists costs a full PBKDF2 run
+        for nothing, so the optimal attack is a single deduplicated
+        dictionary in priority order. Sources stream through a Bloom
+        filter backed by an exact window of recent hashes: a definite
+        duplicate is skipped, but a Bloom false positive outside the
+        window is written anyway - a rare extra duplicate beats ever
+        dropping a real candidate. Rebuilt only when a source changes.
+        """
+        if not sources:
+            return None
+        merged_path = WORDLISTS_DIR / MERGED_WORDLIST
+        try:
+            src_stats = [p.stat() for p in sources]
+            if merged_path.exists():
+                merged_mtime = merged_path.stat().st_mtime
+                if all(s.st_mtime <= merged_mtime for s in src_stats):
+                    return merged_path
+        except OSError:
+            return None
+
+        logger.info("Building merged wordlist from %s sources", len(sources))
+        capacity = sum(s.st_size for s in src_stats) // 9  # ~9 bytes/line
+        bloom = _BloomFilter(capacity)
+        recent = set()
+        tmp_path = str(merged_path) + ".tmp"
+        kept = dropped = 0
+        try:
+            with open(tmp_path, "wb", buffering=1 << 20) as out:
+                for source in sources:
+                    with open(source, "rb") as src:
+                        for line in src:
+                            word = line.rstrip(b"\r\n")
+                            if not word:
+                                continue
+                            digest = hashlib.blake2b(word, digest_size=16).digest()
+                            if bloom.add_digest(digest) and digest[:8] in recent:
+                                dropped += 1
+                                continue
+                            if len(recent) >= 1_000_000:
+                                recent.clear()
+                            recent.add(digest[:8])
+                            out.write(word + b"\n")
+                            kept += 1
+            os.replace(tmp_path, merged_path)
+        except OSError as e:
+            logger.warning("Wordlist merge failed: %s", e)
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            return None
+
+        logger.info("Merged wordlist ready: %s candidates (%s duplicates removed)", kept, dropped)
+        return merged_path
+
+    def length_sorted_wordlist(self, path):
+        """Build (or reuse) a length-sorted variant of a wordlist.
+
+        Streams the source through per-length bucket files (1-63 chars, the
+        valid WPA passphrase range) then concatenates them in ascending
+        order, so nothing close to the full list is ever held in memory.
+        The variant is cached next to the original and rebuilt only when
+        the source mtime changes.
+        """
+        sorted_path = path.with_suffix(path.suffix + ".sorted")
+        try:
+            src_stat = path.stat()
+            if sorted_path.exists():
+                dst_stat = sorted_path.stat()
+                if dst_stat.st_mtime >= src_stat.st_mtime and dst_stat.st_size > 0:
+                    return sorted_path
+        except OSError:
+            return path
+
+        logger.info("Building length-sorted variant: %s", sorted_path.name)
+        buckets = {}
+        tmp_path = str(sorted_path) + ".tmp"
+        try:
+            with open(path, "rb") as src:
+                for line in src:
+                    length = len(line.rstrip(b"\r\n"))
+                    if not 1 <= length <= 63:
+                        continue
+                    bucket = buckets.get(length)
+                    if bucket is None:
+                        bucket = open(f"{tmp_path}.{length}", "wb", buffering=1 << 20)
+                        buckets[length] = bucket
+                    bucket.write(line)
+
+            with open(tmp_path, "wb") as merged:
+                for length in sorted(buckets):
+                    buckets[length].close()
+                    with open(f"{tmp_path}.{length}", "rb") as bucket:
+                        shutil.copyfileobj(bucket, merged, 1 << 20)
+            os.replace(tmp_path, sorted_path)
+            return sorted_path
+        except OSError as e:
+            logger.warning("Length sort failed for %s: %s", path.name, e)
+            return path
+        finally:
+            for bucket in buckets.values():
+                try:
+                    bucket.close()
+                except OSError:
+                    pass
+            for length in buckets:
+                try:
+                    os.remove(f"{tmp_path}.{length}")
+                except OSError:
+                    pass
     
     def verify_tools(self):
-        """Verify required tools are available"""
+        """Verify required tools and cache which ones are present"""
+        self.available_tools = {}
+
         # Check hashcat
-        try:
-            result = subprocess.run(["hashcat", "--version"], capture_output=True, text=True)
-            if result.returncode == 0:
-                logger.info("[OK] Hashcat found")
-            else:
-                logger.error("[ERROR] Hashcat not working")
-        except FileNotFoundError:
+        if shutil.which("hashcat"):
+            self.available_tools["hashcat"] = True
+            logger.info("[OK] Hashcat found")
+        else:
             logger.error("[ERROR] Hashcat not found in PATH")
-        
-        # Check conversion tools
-        conversion_tools = [
-            "hcxpcapngtool",
-            "wsl hcxpcapngtool", 
-            "cap2hccapx",
-            "aircrack-ng"
-        ]
-        
-        tool_found = False
-        for tool in conversion_tools:
+
+        # Conversion tools - the cache lets convert_capture_file skip
+        # attempts whose binary isn't installed at all
+        if shutil.which("hcxpcapngtool"):
+            self.available_tools["hcxpcapngtool"] = True
+            logger.info("[OK] Conversion tool found: hcxpcapngtool")
+
+        # A WSL-hosted hcxpcapngtool needs an actual run to probe
+        if "hcxpcapngtool" not in self.available_tools and shutil.which("wsl"):
             try:
-                result = subprocess.run(tool.split() + ["--version"], capture_output=True)
+                result = subprocess.run(["wsl", "hcxpcapngtool", "--version"],
+                                        capture_output=True, timeout=15)
                 if result.returncode == 0:
-                    logger.info(f"[OK] Conversion tool found: {tool}")
-                    tool_found = True
-                    break
-            except FileNotFoundError:
-                continue
-        
-        if not tool_found:
+                    self.available_tools["wsl hcxpcapngtool"] = True
+                    logger.info("[OK] Conversion tool found: wsl hcxpcapngtool")
+            except (OSError, subprocess.TimeoutExpired):
+                pass
+
+        if not any(t in self.available_tools for t in ("hcxpcapngtool", "wsl hcxpcapngtool")):
             logger.warning("[WARNING] No conversion tools found - may limit functionality")
     
     def on_created(self, event):
+        # on_created fires when the file *appears*, not when the writer is
+        # done - queue it for the debounce worker instead of reading a
+        # half-copied pcap straight into hashcat
         if event.is_file and event.src_path.endswith(('.cap', '.pcap')):
-            self.process_capture_file(event.src_path)
+            self._pending.append(Path(event.src_path))
+
+    def _debounce_worker(self):
+        """Process queued captures once their size has been stable for two polls"""
+        sizes = {}
+        while True:
+            time.sleep(0.5)
+            for _ in range(len(self._pending)):
+                path = self._pending.popleft()
+                try:
+                    size = path.stat().st_size
+                except OSError:
+                    sizes.pop(path, None)
+                    continue
+                last_size, ticks = sizes.get(path, (-1, 0))
+                ticks = ticks + 1 if (size == last_size and size > 0) else 0
+                if ticks >= 2:
+                    sizes.pop(path, None)
+                    if self._is_new_capture(path):
+                        self.process_capture_file(str(path))
+                else:
+                    sizes[path] = (size, ticks)
+                    self._pending.append(path)
+
+    def _is_new_capture(self, path):
+        """Dedupe retried uploads by content hash"""
+        try:
+            digest = hashlib.blake2b(path.read_bytes(), digest_size=16).digest()
+        except OSError:
+            return True
+        if digest in self._seen_hashes:
+            logger.info("Skipping duplicate capture: %s", path.name)
+            return False
+        self._seen_hashes.add(digest)
+        return True
     
     def process_capture_file(self, cap_file):
         """Process new capture file with GPU acceleration"""
         cap_path = Path(cap_file)
         session_name = f"pistorm_{int(time.time())}"
         
-        logger.info(f"🔥 GPU Processing capture: {cap_path.name}")
+        logger.info("🔥 GPU Processing capture: %s", cap_path.name)
         
         # Send status update to Pi
         self.update_pi_status("gpu_ready", 0, cap_path.name)
@@ -135,105 +465,374 @@ class CrackHandler(FileSystemEventHandler):
             if not converted_file:
                 logger.warning("No conversion tools found, attempting direct processing")
                 converted_file = cap_path
-            
-            # Process with each wordlist until success
-            total_wordlists = len(self.wordlists)
-            
-            for i, wordlist in enumerate(self.wordlists):
-                progress = int(10 + (i / total_wordlists) * 80)  # 10-90% range
-                
-                self.update_pi_status("gpu_cracking", progress, cap_path.name)
-                logger.info(f"🚀 GPU Processing with wordlist: {wordlist.name}")
-                
-                result = self.run_hashcat(converted_file, wordlist, session_name)
-                
-                if result:
-                    logger.info(f"🎉 Password cracked: {result}")
-                    self.update_pi_status("completed", 100, cap_path.name)
-                    self.send_result_to_pi(cap_path.stem, result)
-                    return
-                else:
-                    logger.info(f"No passwords found with {wordlist.name}")
-            
+
+            # A capture cracked in any earlier session costs a sub-second
+            # potfile lookup instead of a full GPU run
+            cached = self._check_potfile(converted_file)
+            if cached:
+                logger.info("🎉 Password already in potfile: %s", cached)
+                self.update_pi_status("completed", 100, cap_path.name)
+                self.send_result_to_pi(cap_path.stem, cached)
+                return
+
+            # One persistent hashcat session fed over stdin - a single
+            # kernel compile and autotune for the whole wordlist queue
+            result = self.crack_stdin_session(converted_file, session_name, cap_path.name)
+
+            if result:
+                logger.info("🎉 Password cracked: %s", result)
+                self.update_pi_status("completed", 100, cap_path.name)
+                self.send_result_to_pi(cap_path.stem, result)
+                return
+
             # No password found
-            logger.info(f"🔍 GPU processing complete - No passwords cracked for {cap_path.name}")
+            logger.info("🔍 GPU processing complete - No passwords cracked for %s", cap_path.name)
             self.update_pi_status("completed", 100, cap_path.name)
             self.send_result_to_pi(cap_path.stem, "NOT FOUND")
             
         except Exception as e:
-            logger.error(f"GPU processing error: {e}")
+            logger.error("GPU processing error: %s", e)
             self.send_result_to_pi(cap_path.stem, "ERROR")
     
+    def _check_potfile(self, target_file):
+        """Return a previously cracked password for this target, if any"""
+        if not POTFILE.exists():
+            return None
+        mode = "2500" if str(target_file).endswith('.hccapx') else "22000"
+        try:
+            result = subprocess.run(
+                ["hashcat", "--show", "-m", mode, "--potfile-path", str(POTFILE), str(target_file)],
+                capture_output=True, text=True, timeout=30)
+        except Exception as e:
+            logger.warning("Potfile check failed: %s", e)
+            return None
+        if result.returncode == 0:
+            for line in result.stdout.strip().splitlines():
+                if ':' in line:
+                    password = line.split(':')[-1].strip()
+                    if password:
+                        return password
+        return None
+
     def convert_capture_file(self, cap_file):
         """Convert capture file to hashcat format"""
         base_name = cap_file.stem
+        base = os.path.join(RESULTS_DIR_STR, base_name)
+
+        # hc22000 supersedes hccapx/netntlm - it carries both PMKID and
+        # EAPOL entries in one file, so only hcxpcapngtool output is worth
+        # producing; the old cap2hccapx/aircrack fallbacks fed a legacy
+        # format that forced the 2500 mode fallback downstream
         output_formats = [
-            (RESULTS_DIR / f"{base_name}.22000", "22000"),
-            (RESULTS_DIR / f"{base_name}.hccapx", "hccapx"),
-            (RESULTS_DIR / f"{base_name}.netntlm", "netntlm")
+            (base + ".22000", "22000")
         ]
-        
-        # Try different conversion tools
+
+        # argv lists, not shell strings: no cmd.exe//bin/sh fork per
+        # attempt, and paths with spaces can't break the command
         conversion_commands = [
-            f"hcxpcapngtool -o {{output}} {cap_file}",
-            f"wsl hcxpcapngtool -o {{output}} {cap_file}",
-            f"cap2hccapx {cap_file} {{output}}",
-            f"aircrack-ng -J {base_name} {cap_file}"
+            ("hcxpcapngtool", ["hcxpcapngtool", "-o", "{output}", str(cap_file)]),
+            ("wsl hcxpcapngtool", ["wsl", "hcxpcapngtool", "-o", "{output}", str(cap_file)])
         ]
         
+        # Every tool/format combination is independent - run them
+        # concurrently and take the first that produces output, skipping
+        # tools verify_tools already found missing. Each attempt writes to
+        # its own temp path so two converters never race on the same
+        # output file.
+        attempts = []
         for output_file, format_type in output_formats:
-            for cmd_template in conversion_commands:
-                try:
-                    cmd = cmd_template.format(output=output_file)
-                    logger.info(f"Trying conversion: {cmd}")
-                    
-                    result = subprocess.run(cmd, shell=True, capture_output=True, text=True, timeout=60)
-                    
-                    if result.returncode == 0 and output_file.exists() and output_file.stat().st_size > 0:
-                        logger.info(f"✅ Conversion successful: {output_file}")
-                        return output_file
-                    else:
-                        logger.warning(f"{cmd} failed: {result.stderr}")
-                        
-                except Exception as e:
-                    logger.warning(f"Conversion attempt failed: {e}")
+            for i, (tool, argv) in enumerate(conversion_commands):
+                if not self.available_tools.get(tool):
                     continue
-        
+                tmp_out = f"{output_file}.try{i}"
+                cmd = [arg.replace("{output}", tmp_out) for arg in argv]
+                attempts.append((output_file, tmp_out, cmd))
+
+        if not attempts:
+            logger.warning("All conversion attempts failed")
+            return None
+
+        procs = []
+
+        def kill_attempt(proc):
+            # Kill the whole group so anything the converter spawned dies
+            # and releases its pipes too
+            try:
+                if os.name == "posix":
+                    os.killpg(proc.pid, signal.SIGKILL)
+                else:
+                    proc.kill()
+            except (OSError, ProcessLookupError):
+                pass
+
+        def attempt(output_file, tmp_out, cmd):
+            logger.info("Trying conversion: %s", " ".join(cmd))
+            try:
+                proc = subprocess.Popen(cmd, stdout=subprocess.PIPE,
+                                        stderr=subprocess.PIPE, text=True,
+                                        start_new_session=(os.name == "posix"))
+                procs.append(proc)
+                try:
+                    _, stderr = proc.communicate(timeout=60)
+                except subprocess.TimeoutExpired:
+                    kill_attempt(proc)
+                    proc.communicate()
+                    return None
+                if proc.returncode == 0 and os.path.exists(tmp_out) and os.path.getsize(tmp_out) > 0:
+                    return (output_file, tmp_out)
+                logger.warning("%s failed: %s", " ".join(cmd), stderr)
+            except Exception as e:
+                logger.warning("Conversion attempt failed: %s", e)
+            return None
+
+        winner = None
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            pending = {pool.submit(attempt, *args) for args in attempts}
+            while pending and winner is None:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    result = future.result()
+                    if result:
+                        winner = result
+                        break
+            if winner:
+                for future in pending:
+                    future.cancel()
+                for proc in procs:
+                    if proc.poll() is None:
+                        kill_attempt(proc)
+
+        for _, tmp_out, _ in attempts:
+            if winner is None or tmp_out != winner[1]:
+                try:
+                    os.remove(tmp_out)
+                except OSError:
+                    pass
+
+        if winner:
+            output_file, tmp_out = winner
+            os.replace(tmp_out, output_file)
+            logger.info("✅ Conversion successful: %s", output_file)
+            self._log_hc22000_records(output_file)
+            return Path(output_file)
+
         logger.warning("All conversion attempts failed")
         return None
+
+    def _log_hc22000_records(self, path):
+        """Log the PMKID/EAPOL record mix of an hc22000 file"""
+        pmkid = eapol = 0
+        try:
+            with open(path, "rb") as fh:
+                for line in fh:
+                    if line.startswith(b"WPA*01*"):
+                        pmkid += 1
+                    elif line.startswith(b"WPA*02*"):
+                        eapol += 1
+        except OSError:
+            return
+        logger.info("hc22000 records: %s PMKID, %s EAPOL", pmkid, eapol)
     
+    def crack_stdin_session(self, target_file, session, filename):
+        """Crack with a single hashcat process fed candidates over stdin.
+
+        Each fresh hashcat invocation re-compiles kernels and re-autotunes -
+        seconds of dead GPU time per wordlist. Running one --stdin session
+        and concatenating the wordlists into it in priority order pays that
+        cost exactly once. stdout is read line-by-line so a crack terminates
+        the run immediately, and a watchdog replaces the old flat 300s
+        timeout: the process is only killed when stdout has been silent for
+        HASHCAT_IDLE_KILL seconds.
+        """
+        mode = "2500" if str(target_file).endswith('.hccapx') else "22000"
+
+        cmd = [
+            "hashcat",
+            "-m", mode,
+            "-a", "0",
+            "-w", str(HASHCAT_WORKLOAD),
+            "-S",  # host-side candidates; also the natural fit for stdin mode
+            "--session", session,
+            str(target_file)
+        ]
+
+        cmd.extend(HASHCAT_BACKEND_ARGS)
+        cmd.extend(HASHCAT_KERNEL_TUNING)
+
+        if HASHCAT_OPTIMIZE:
+            cmd.append("-O")
+        if HASHCAT_FORCE:
+            cmd.append("--force")
+        cmd.extend(["--status", "--status-timer=10"])
+
+        # Write hits straight to an outfile so extract_password can read
+        # them without a second hashcat startup
+        outfile = RESULTS_DIR / f"{session}.out"
+        cmd.extend(["--outfile", str(outfile), "--outfile-format", "2"])
+        cmd.extend(["--potfile-path", str(POTFILE)])
+
+        logger.info("💻 GPU Command: hashcat -m %s -S [stdin session] (%s wordlists)", mode, len(self.wordlists))
+
+        try:
+            proc = subprocess.Popen(
+                cmd,
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
+                text=True,
+                bufsize=1
+            )
+        except Exception as e:
+            logger.error("Failed to start hashcat session: %s", e)
+            return None
+
+        feeder = threading.Thread(target=self._feed_wordlists,
+                                  args=(proc, filename, self.wordlists), daemon=True)
+        feeder.start()
+
+        if self._watch_hashcat(proc, filename):
+            return self.extract_password(target_file, mode, outfile)
+        return None
+
+    def _watch_hashcat(self, proc, filename=None):
+        """Stream a hashcat process's stdout; True once it reports Cracked.
+
+        Terminates the process the moment a hit appears instead of
+        waiting out the run, and drives live Pi progress from hashcat's
+        own Progress lines when a filename is given. An idle watchdog
+        kills the run only if stdout goes silent for HASHCAT_IDLE_KILL
+        seconds - there is no flat wall-clock timeout.
+        """
+        last_output = [time.time()]
+
+        def watchdog():
+            while proc.poll() is None:
+                if time.time() - last_output[0] > HASHCAT_IDLE_KILL:
+                    logger.warning("Hashcat stdout idle for %ss - killing run", HASHCAT_IDLE_KILL)
+                    proc.kill()
+                    return
+                time.sleep(5)
+
+        threading.Thread(target=watchdog, daemon=True).start()
+
+        cracked = False
+        try:
+            for line in proc.stdout:
+                last_output[0] = time.time()
+                if "Status...........: Cracked" in line:
+                    cracked = True
+                    break
+                if filename is not None:
+                    match = _PROGRESS_RE.search(line)
+                    if match:
+                        done, total = int(match.group(1)), int(match.group(2))
+                        if total:
+                            progress = int(10 + (done / total) * 80)  # 10-90% range
+                            self.update_pi_status("gpu_cracking", progress, filename)
+        except Exception as e:
+            logger.error("Error reading hashcat output: %s", e)
+
+        if proc.stdin is not None:
+            try:
+                proc.stdin.close()
+            except OSError:
+                pass
+        if cracked:
+            proc.terminate()
+        proc.wait()
+        return cracked
+
+    def _feed_wordlists(self, proc, filename, wordlists):
+        """Concatenate the given wordlists into the hashcat session's stdin"""
+        total_wordlists = len(wordlists)
+        try:
+            stdin = proc.stdin.buffer
+            for i, wordlist in enumerate(wordlists):
+                if filename is not None:
+                    progress = int(10 + (i / total_wordlists) * 80)  # 10-90% range
+                    self.update_pi_status("gpu_cracking", progress, filename)
+                logger.info("🚀 Feeding wordlist: %s", wordlist.name)
+                with open(wordlist, "rb") as fh:
+                    self._feed_file(fh, stdin)
+            proc.stdin.close()
+        except (OSError, ValueError):
+            # hashcat exited first - cracked, exhausted, or killed
+            pass
+
+    @staticmethod
+    def _feed_file(fh, stdin):
+        """Push one open file into the pipe, zero-copy where the OS allows.
+
+        On Linux/WSL os.sendfile moves the bytes kernel-side - no
+        userspace memcpy of a possibly 100GB wordlist, leaving the CPU to
+        hashcat's own candidate handling. Elsewhere (native Windows) it
+        falls back to the buffered 1MiB copy loop, which resumes from
+        wherever sendfile got to if the kernel path bails mid-file.
+        """
+        in_fd = fh.fileno()
+        if hasattr(os, "posix_fadvise"):
+            try:
+                os.posix_fadvise(in_fd, 0, 0, os.POSIX_FADV_SEQUENTIAL)
+            except OSError:
+                pass
+
+        offset = 0
+        if hasattr(os, "sendfile"):
+            stdin.flush()  # nothing buffered may overtake the raw fd writes
+            out_fd = stdin.fileno()
+            try:
+                while True:
+                    sent = os.sendfile(out_fd, in_fd, offset, 1 << 30)
+                    if sent == 0:
+                        return
+                    offset += sent
+            except OSError:
+                # sendfile into a pipe isn't supported everywhere - resume
+                # with the userspace copy from where we left off
+                fh.seek(offset)
+
+        shutil.copyfileobj(fh, stdin, 1 << 20)
+
     def run_hashcat(self, target_file, wordlist, session):
         """Run hashcat with GPU acceleration"""
-        
-        # Determine hashcat mode based on file extension
-        if str(target_file).endswith('.22000'):
-            mode = "22000"  # WPA-PBKDF2-PMKID+EAPOL
-        elif str(target_file).endswith('.hccapx'):
-            mode = "2500"   # WPA/WPA2
-        else:
-            # Try multiple modes for .cap files
-            modes = ["22000", "2500", "22001"]  # WPA3 support
-            for mode in modes:
-                result = self._run_hashcat_mode(target_file, wordlist, session, mode)
-                if result:
-                    return result
-            return None
-        
+
+        # hc22000 handles both PMKID and EAPOL records, so the old
+        # 22000/2500/22001 fallback loop (a full cold start per mode) is
+        # redundant; 2500 survives only for legacy .hccapx files
+        mode = "2500" if str(target_file).endswith('.hccapx') else "22000"
         return self._run_hashcat_mode(target_file, wordlist, session, mode)
     
     def _run_hashcat_mode(self, target_file, wordlist, session, mode):
         """Run hashcat with specific mode"""
-        
+
+        # Small dictionaries finish before -w 3 autotune pays for itself
+        workload = HASHCAT_WORKLOAD
+        try:
+            if wordlist.stat().st_size < 50 * 1024 * 1024:
+                workload = 2
+        except OSError:
+            pass
+
+        # No wordlist argument: candidates are piped in via stdin, which
+        # skips hashcat's dictionary cache and keyspace estimation - both
+        # cost far more than the crack itself on small lists
         cmd = [
             "hashcat",
             "-m", mode,
             "-a", "0",  # Dictionary attack
-            "-w", str(HASHCAT_WORKLOAD),
+            "-w", str(workload),
             "--session", f"{session}_{mode}",
-            str(target_file),
-            str(wordlist)
+            str(target_file)
         ]
-        
+
+        # Host-side candidate generation keeps the GPU pipeline fed on
+        # slow-hash WPA modes instead of stalling the kernel generator
+        if mode in ("22000", "2500", "22001"):
+            cmd.append("-S")
+
+        cmd.extend(HASHCAT_BACKEND_ARGS)
+        cmd.extend(HASHCAT_KERNEL_TUNING)
+
         if HASHCAT_OPTIMIZE:
             cmd.append("-O")
         
@@ -242,35 +841,56 @@ class CrackHandler(FileSystemEventHandler):
         
         # Add status updates
         cmd.extend(["--status", "--status-timer=10"])
-        
-        logger.info(f"💻 GPU Command: hashcat -m {mode} -O -w {HASHCAT_WORKLOAD} [file] {wordlist.name}")
-        
+
+        outfile = RESULTS_DIR / f"{session}_{mode}.out"
+        cmd.extend(["--outfile", str(outfile), "--outfile-format", "2"])
+        cmd.extend(["--potfile-path", str(POTFILE)])
+
+        logger.info("💻 GPU Command: hashcat -m %s -O -w %s [file] %s (stdin)", mode, workload, wordlist.name)
+
         try:
-            # Run hashcat
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=300)
-            
-            # Check for successful crack
-            if "Status...........: Cracked" in result.stdout:
-                return self.extract_password(target_file, mode)
-            elif result.returncode == 0:
-                logger.info(f"Hashcat completed successfully but no password found")
-                return None
-            else:
-                logger.warning(f"Hashcat failed with mode {mode}: {result.stderr}")
-                return None
-                
-        except subprocess.TimeoutExpired:
-            logger.warning(f"Hashcat timeout with mode {mode}")
-            return None
+            # Stream stdout live rather than buffering the whole run -
+            # a hit terminates immediately instead of after the full pass
+            proc = subprocess.Popen(cmd, stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                                    stderr=subprocess.STDOUT, text=True, bufsize=1)
         except Exception as e:
-            logger.error(f"Hashcat error with mode {mode}: {e}")
+            logger.error("Hashcat error with mode %s: %s", mode, e)
             return None
+
+        threading.Thread(target=self._feed_wordlists,
+                         args=(proc, None, [wordlist]), daemon=True).start()
+
+        if self._watch_hashcat(proc):
+            return self.extract_password(target_file, mode, outfile)
+
+        if proc.returncode in (0, 1):  # 1 = exhausted keyspace
+            logger.info("Hashcat completed successfully but no password found")
+        else:
+            logger.warning("Hashcat failed with mode %s (exit %s)", mode, proc.returncode)
+        return None
     
-    def extract_password(self, target_file, mode):
+    def extract_password(self, target_file, mode, outfile=None):
         """Extract cracked password from hashcat"""
+        # The crack run already wrote the plain password to its outfile
+        # (--outfile-format 2) - read it back instead of paying another
+        # hashcat startup just to dump the potfile
+        if outfile is not None:
+            try:
+                lines = [l.strip() for l in Path(outfile).read_text(errors="replace").splitlines()]
+                for line in reversed(lines):
+                    if line:
+                        # outfile-format 2 lines are the bare password -
+                        # splitting on ':' here would truncate passphrases
+                        # that legitimately contain one
+                        return line
+            except OSError as e:
+                logger.warning("Could not read outfile %s: %s", outfile, e)
+
         try:
-            # Use hashcat --show to get the password
-            cmd = ["hashcat", "--show", "-m", mode, str(target_file)]
+            # Fallback: hashcat --show against the shared potfile the crack
+            # runs write to (not hashcat's default one)
+            cmd = ["hashcat", "--show", "-m", mode,
+                   "--potfile-path", str(POTFILE), str(target_file)]
             result = subprocess.run(cmd, capture_output=True, text=True, timeout=30)
             
             if result.returncode == 0 and result.stdout.strip():
@@ -285,52 +905,50 @@ class CrackHandler(FileSystemEventHandler):
             return None
             
         except Exception as e:
-            logger.error(f"Error extracting password: {e}")
+            logger.error("Error extracting password: %s", e)
             return None
     
     def update_pi_status(self, status, progress, filename):
-        """Send status update to Pi"""
+        """Queue a status update for the Pi (non-blocking)"""
+        url = f"http://{PI_IP}:{PI_PORT}/gpu_status"
+        data = dict(self._status_template)
+        data.update({
+            "status": status,
+            "progress": progress,
+            "filename": filename,
+            # Integer nanoseconds - the Pi stores it opaquely, no need to
+            # pay for a datetime + isoformat per tick
+            "timestamp": time.time_ns()
+        })
+
+        # Status ticks are disposable - if the sender is backed up, drop
+        # the oldest tick rather than stalling the crack loop
         try:
-            url = f"http://{PI_IP}:{PI_PORT}/gpu_status"
-            headers = {"X-API-Key": PI_API_KEY, "Content-Type": "application/json"}
-            data = {
-                "status": status,
-                "progress": progress,
-                "filename": filename,
-                "timestamp": datetime.now().isoformat(),
-                "gpu_info": "RTX 4070 Super"
-            }
-            
-            response = requests.post(url, json=data, headers=headers, timeout=5)
-            if response.status_code != 200:
-                logger.warning(f"Pi status update failed: {response.status_code}")
-                
-        except Exception as e:
-            logger.warning(f"Failed to update Pi status: {e}")
-    
+            self._pi_queue.put_nowait(("status", url, data, 5))
+        except queue.Full:
+            try:
+                self._pi_queue.get_nowait()
+                self._pi_queue.task_done()
+                self._pi_queue.put_nowait(("status", url, data, 5))
+            except (queue.Empty, queue.Full):
+                pass
+
     def send_result_to_pi(self, target, password):
-        """Send cracking result back to Pi"""
-        try:
-            url = f"http://{PI_IP}:{PI_PORT}/crack_result"
-            headers = {"X-API-Key": PI_API_KEY, "Content-Type": "application/json"}
-            data = {
-                "target": target,
-                "password": password,
-                "timestamp": datetime.now().isoformat(),
-                "cracked_by": "windows-gpu-rtx4070",
-                "processing_time": time.time(),
-                "wordlists_tried": len(self.wordlists)
-            }
-            
-            response = requests.post(url, json=data, headers=headers, timeout=10)
-            
-            if response.status_code == 200:
-                logger.info(f"✅ Result sent to Pi successfully")
-            else:
-                logger.error(f"❌ Failed to send result to Pi: {response.status_code}")
-            
-        except Exception as e:
-            logger.error(f"❌ Error sending result to Pi: {e}")
+        """Send cracking result back to Pi (waits for delivery)"""
+        url = f"http://{PI_IP}:{PI_PORT}/crack_result"
+        data = {
+            "target": target,
+            "password": password,
+            "timestamp": time.time_ns(),
+            "cracked_by": "windows-gpu-rtx4070",
+            "processing_time": time.time(),
+            "wordlists_tried": len(self.wordlists)
+        }
+
+        # Results are not disposable: block for a queue slot, then wait
+        # until the sender has flushed everything ahead of it
+        self._pi_queue.put(("result", url, data, 10))
+        self._pi_queue.join()
 
 def main():
     print("=== 🚀 PiStorm GPU Listener - Windows PC ===")
@@ -342,23 +960,23 @@ def main():
     print(f"🔑 Authenticated: API Key configured")
     print("=" * 50)
     
-    # Test Pi connectivity
+    # Setup file watcher (also owns the keep-alive session to the Pi)
+    event_handler = CrackHandler()
+
+    # Test Pi connectivity - the ping also warms the pooled connection
     try:
-        response = requests.get(f"http://{PI_IP}:{PI_PORT}/ping", timeout=5)
+        response = event_handler.sess.get(f"http://{PI_IP}:{PI_PORT}/ping", timeout=5)
         if response.status_code == 200:
             logger.info("✅ Pi connectivity verified")
         else:
             logger.warning("⚠️ Pi responded but with error")
     except:
         logger.warning("⚠️ Cannot reach Pi - continuing anyway")
-    
-    # Setup file watcher
-    event_handler = CrackHandler()
     observer = Observer()
-    observer.schedule(event_handler, str(INCOMING_DIR), recursive=False)
+    observer.schedule(event_handler, INCOMING_DIR_STR, recursive=False)
     observer.start()
     
-    logger.info(f"Started monitoring {INCOMING_DIR}")
+    logger.info("Started monitoring %s", INCOMING_DIR)
     logger.info("Waiting for capture files... (Ctrl+C to stop)")
     
     try:
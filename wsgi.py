@@ -0,0 +1,24 @@
+#!/usr/bin/env python3
+"""
+WSGI entry point for the Wi-Fi Controller API
+Serve with a real WSGI server instead of the single-threaded Flask dev server:
+
+    gunicorn --workers=1 --threads=8 --bind=0.0.0.0:5000 --reuse-port wsgi:application
+
+Attack and interface state live in-process, so scale request handling with
+threads (--threads), not extra worker processes - a second worker would get
+its own empty attack_state. --reuse-port lets a replacement instance bind
+before the old one exits for zero-downtime restarts.
+
+Eight threads keep the polling endpoints (/text, /status_simple,
+/networks/*) responsive even while one request sits in a 20s iw scan and
+another waits on the GPU PC. gevent workers would serve the same goal but
+monkey.patch_all is a poor fit here - the API leans on real threads,
+subprocess pipelines and process-group signalling throughout.
+"""
+
+from wifi_api import app as application
+
+if __name__ == "__main__":
+    # Fallback for direct invocation during development
+    application.run(host="0.0.0.0", port=5000, debug=False)